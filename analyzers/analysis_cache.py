@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from analyzers.pain_analysis import PainAnalysis
+import config
+
+class AnalysisCache:
+    """Ограниченный LRU-кэш результатов analyze_pain по нормализованному тексту вопроса
+    
+    Результаты неизменяемы (PainAnalysis), поэтому отдаются без копирования.
+    Операции защищены блокировкой: анализ может идти в пуле потоков бота.
+    """
+    
+    def __init__(self, max_size: int = None):
+        """Инициализация кэша"""
+        self.max_size = config.ANALYSIS_CACHE_SIZE if max_size is None else max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[PainAnalysis]:
+        """Возвращает сохраненный анализ или None"""
+        with self._lock:
+            analysis = self._entries.get(key)
+            
+            if analysis is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return analysis
+    
+    def put(self, key: str, analysis: PainAnalysis):
+        """Сохраняет анализ, вытесняя давно не использованные"""
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self):
+        """Сбрасывает все записи (например, после смены словарей)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика попаданий, промахов и вытеснений"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,107 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List
+
+# Предел памяти переходов по словам в match_many (при переполнении она сбрасывается)
+WORD_MEMO_LIMIT = 100_000
+
+class KeywordAutomaton:
+    """Автомат Ахо–Корасик: все ключевые слова всех групп ищутся за один проход по тексту
+    
+    Каждой группе соответствует бит; match возвращает маску групп, хотя бы одно
+    слово которых встречается в тексте как подстрока (как `word in text`).
+    """
+    
+    def __init__(self, groups: Dict[Hashable, Iterable[str]]):
+        """Строит бор, суффиксные ссылки и полную таблицу переходов"""
+        self.bits: Dict[Hashable, int] = {}
+        goto: List[Dict[str, int]] = [{}]
+        outputs = [0]
+        
+        for group, words in groups.items():
+            bit = self.bits.setdefault(group, 1 << len(self.bits))
+            for word in words:
+                if not word:
+                    # Пустая строка содержится в любом тексте
+                    outputs[0] |= bit
+                    continue
+                
+                state = 0
+                for char in word:
+                    if char not in goto[state]:
+                        goto.append({})
+                        outputs.append(0)
+                        goto[state][char] = len(goto) - 1
+                    state = goto[state][char]
+                outputs[state] |= bit
+        
+        # Обход в ширину: суффиксная ссылка ведет в более короткое состояние
+        fail = [0] * len(goto)
+        transitions: List[Dict[str, int]] = [{}] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            # Выход состояния включает выходы всех его суффиксов ('уверен' внутри 'не уверен')
+            outputs[state] |= outputs[fail[state]]
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            
+            for char, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(char, 0)
+                queue.append(child)
+        
+        self._transitions = transitions
+        self._outputs = outputs
+        self._space = [transition.get(' ', 0) for transition in transitions]
+    
+    def match(self, text: str) -> int:
+        """Маска групп, найденных в тексте (регистр не меняется)"""
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        found = outputs[0]
+        
+        for char in text:
+            state = transitions[state].get(char, 0)
+            found |= outputs[state]
+        
+        return found
+    
+    def match_many(self, texts: Iterable[str]) -> Iterator[int]:
+        """Маски для пачки текстов (генератор)
+        
+        Переход по целому слову из данного состояния запоминается на время вызова:
+        слова в пачке повторяются, и повторное слово стоит один поиск в словаре.
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        space = self._space
+        memo = {}
+        
+        for text in texts:
+            state = 0
+            found = outputs[0]
+            first = True
+            
+            for word in text.split(' '):
+                if first:
+                    first = False
+                else:
+                    state = space[state]
+                    found |= outputs[state]
+                
+                step = memo.get((state, word))
+                if step is None:
+                    word_state = state
+                    word_found = 0
+                    for char in word:
+                        word_state = transitions[word_state].get(char, 0)
+                        word_found |= outputs[word_state]
+                    if len(memo) >= WORD_MEMO_LIMIT:
+                        memo.clear()
+                    step = memo[(state, word)] = (word_state, word_found)
+                
+                state = step[0]
+                found |= step[1]
+            
+            yield found
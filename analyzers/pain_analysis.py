@@ -0,0 +1,177 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterator, Sequence, Tuple
+
+# Ключи анализа в том же порядке, что и в прежнем словаре analyze_pain
+ANALYSIS_KEYS = (
+    'main_pain', 'pain_categories', 'emotions', 'urgency_level',
+    'severity_level', 'question_type', 'confidence_score', 'recommendations'
+)
+
+def formulate_main_pain(categories: Sequence[str], emotions: Sequence[str], urgency: str, severity: str) -> str:
+    """Формулирует основную боль на основе анализа"""
+    if not categories and not emotions:
+        return "неопределенная потребность в помощи"
+    
+    pain_description = []
+    
+    if categories:
+        pain_description.append(f"проблема с {', '.join(categories)}")
+    
+    if emotions:
+        pain_description.append(f"эмоциональное состояние: {', '.join(emotions)}")
+    
+    if urgency == 'высокий':
+        pain_description.append("высокая срочность решения")
+    
+    if severity == 'высокая':
+        pain_description.append("критическая важность")
+    
+    return ". ".join(pain_description)
+
+def generate_recommendations(categories: Sequence[str], emotions: Sequence[str], question_type: str) -> list:
+    """Генерирует рекомендации на основе анализа"""
+    recommendations = []
+    
+    if 'страх' in categories:
+        recommendations.append("Попробуйте техники дыхания и медитации")
+        recommendations.append("Обратитесь к специалисту по тревожности")
+    
+    if 'одиночество' in categories:
+        recommendations.append("Присоединитесь к сообществам по интересам")
+        recommendations.append("Попробуйте новые хобби для знакомств")
+    
+    if 'неуверенность' in categories:
+        recommendations.append("Составьте план действий с конкретными шагами")
+        recommendations.append("Начните с малых достижений")
+    
+    if 'работа' in categories:
+        recommendations.append("Проанализируйте свои сильные стороны")
+        recommendations.append("Рассмотрите возможности развития")
+    
+    if question_type == 'просьба о помощи':
+        recommendations.append("Не бойтесь просить о помощи у близких")
+        recommendations.append("Обратитесь к профессионалам в данной области")
+    
+    if not recommendations:
+        recommendations.append("Попробуйте разбить проблему на части")
+        recommendations.append("Ищите поддержку в сообществах")
+    
+    return recommendations
+
+class PainSchema:
+    """Общие для всех анализов имена категорий и эмоций: i-й бит маски — i-е имя"""
+    
+    __slots__ = ('category_names', 'emotion_names', '_categories', '_emotions')
+    
+    def __init__(self, category_names: Sequence[str], emotion_names: Sequence[str]):
+        self.category_names = tuple(sys.intern(name) for name in category_names)
+        self.emotion_names = tuple(sys.intern(name) for name in emotion_names)
+        # Маска -> кортеж имен; одинаковые наборы разделяются всеми анализами
+        self._categories: Dict[int, Tuple[str, ...]] = {}
+        self._emotions: Dict[int, Tuple[str, ...]] = {}
+    
+    def __reduce__(self):
+        return PainSchema, (self.category_names, self.emotion_names)
+    
+    def categories(self, mask: int) -> Tuple[str, ...]:
+        """Категории боли по маске, в порядке словаря"""
+        names = self._categories.get(mask)
+        if names is None:
+            names = self._categories[mask] = self._decode(self.category_names, mask)
+        return names
+    
+    def emotions(self, mask: int) -> Tuple[str, ...]:
+        """Эмоции по маске, в порядке словаря"""
+        names = self._emotions.get(mask)
+        if names is None:
+            names = self._emotions[mask] = self._decode(self.emotion_names, mask)
+        return names
+    
+    @staticmethod
+    def _decode(names: Tuple[str, ...], mask: int) -> Tuple[str, ...]:
+        return tuple(name for bit, name in enumerate(names) if mask >> bit & 1)
+
+class PainAnalysis(Mapping):
+    """Компактный неизменяемый результат анализа боли
+    
+    Категории и эмоции хранятся битовыми масками над общей схемой, уровни и тип
+    вопроса — ссылками на общие строки, а main_pain и recommendations форматируются
+    при обращении. Доступ как к словарю (analysis['emotions'], .get, **) сохранен;
+    последовательности отдаются кортежами, to_dict() возвращает прежний словарь со списками.
+    """
+    
+    __slots__ = ('_schema', '_categories', '_emotions', 'urgency_level', 'severity_level', 'question_type', 'confidence_score')
+    
+    def __init__(self, schema: PainSchema, categories: int, emotions: int, urgency_level: str,
+                 severity_level: str, question_type: str, confidence_score: float):
+        set_slot = object.__setattr__
+        set_slot(self, '_schema', schema)
+        set_slot(self, '_categories', categories)
+        set_slot(self, '_emotions', emotions)
+        set_slot(self, 'urgency_level', urgency_level)
+        set_slot(self, 'severity_level', severity_level)
+        set_slot(self, 'question_type', question_type)
+        set_slot(self, 'confidence_score', confidence_score)
+    
+    @property
+    def pain_categories(self) -> Tuple[str, ...]:
+        return self._schema.categories(self._categories)
+    
+    @property
+    def emotions(self) -> Tuple[str, ...]:
+        return self._schema.emotions(self._emotions)
+    
+    @property
+    def main_pain(self) -> str:
+        return formulate_main_pain(self.pain_categories, self.emotions, self.urgency_level, self.severity_level)
+    
+    @property
+    def recommendations(self) -> Tuple[str, ...]:
+        return tuple(generate_recommendations(self.pain_categories, self.emotions, self.question_type))
+    
+    def __getitem__(self, key: str):
+        if key not in ANALYSIS_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(ANALYSIS_KEYS)
+    
+    def __len__(self) -> int:
+        return len(ANALYSIS_KEYS)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Mapping):
+            return self.to_dict() == (other.to_dict() if isinstance(other, PainAnalysis) else dict(other))
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __setattr__(self, name: str, value):
+        raise AttributeError("PainAnalysis неизменяем")
+    
+    def __delattr__(self, name: str):
+        raise AttributeError("PainAnalysis неизменяем")
+    
+    def __reduce__(self):
+        return PainAnalysis, (self._schema, self._categories, self._emotions, self.urgency_level,
+                              self.severity_level, self.question_type, self.confidence_score)
+    
+    def __repr__(self) -> str:
+        return f"PainAnalysis({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict[str, any]:
+        """Обычный словарь в прежнем формате analyze_pain (списки вместо кортежей)"""
+        categories = self.pain_categories
+        emotions = self.emotions
+        return {
+            'main_pain': formulate_main_pain(categories, emotions, self.urgency_level, self.severity_level),
+            'pain_categories': list(categories),
+            'emotions': list(emotions),
+            'urgency_level': self.urgency_level,
+            'severity_level': self.severity_level,
+            'question_type': self.question_type,
+            'confidence_score': self.confidence_score,
+            'recommendations': generate_recommendations(categories, emotions, self.question_type)
+        }
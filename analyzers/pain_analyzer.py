@@ -1,5 +1,8 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from analyzers.keyword_automaton import KeywordAutomaton
+from analyzers.pain_analysis import PainAnalysis, PainSchema
+from analyzers.analysis_cache import AnalysisCache
 
 class PainAnalyzer:
     def __init__(self):
@@ -36,148 +39,211 @@ class PainAnalyzer:
             'частота': ['постоянно', 'всегда', 'никогда', 'часто', 'редко', 'иногда'],
             'влияние': ['влияет', 'мешает', 'мешает жить', 'портит', 'разрушает']
         }
-    
-    def analyze_pain(self, question: str) -> Dict[str, any]:
-        """Анализирует скрытую боль в вопросе"""
-        question_lower = question.lower()
         
-        # Определяем основные категории боли
-        pain_categories = self._identify_pain_categories(question_lower)
+        # Фразы для определения типа вопроса (проверяются по порядку)
+        self.question_type_markers = {
+            'просьба о помощи': ['как', 'что делать', 'помогите', 'подскажите'],
+            'поиск причины': ['почему', 'зачем', 'откуда', 'когда'],
+            'поиск подтверждения': ['можно ли', 'стоит ли', 'правильно ли'],
+            'поиск мнения': ['что думаете', 'ваше мнение', 'как считаете']
+        }
         
-        # Анализируем эмоциональное состояние
-        emotions = self._analyze_emotions(question_lower)
+        # Маркеры низкой срочности и серьезности
+        self.low_urgency_markers = ['вчера', 'давно']
+        self.low_severity_markers = ['может быть', 'возможно']
         
-        # Определяем уровень срочности
-        urgency_level = self._analyze_urgency(question_lower)
+        # Кэш результатов: одни и те же вопросы приходят раунд за раундом
+        self.analysis_cache = AnalysisCache()
         
-        # Определяем серьезность проблемы
-        severity_level = self._analyze_severity(question_lower)
+        # Закрепленная таблица анализов встроенного корпуса (см. precompute): не вытесняется
+        self._pinned_keys: List[str] = []
+        self._pinned: Dict[str, PainAnalysis] = {}
         
-        # Определяем тип вопроса
-        question_type = self._analyze_question_type(question_lower)
-        
-        # Формулируем основную боль
-        main_pain = self._formulate_main_pain(pain_categories, emotions, urgency_level, severity_level)
-        
-        # Генерируем рекомендации
-        recommendations = self._generate_recommendations(pain_categories, emotions, question_type)
-        
-        return {
-            'main_pain': main_pain,
-            'pain_categories': pain_categories,
-            'emotions': emotions,
-            'urgency_level': urgency_level,
-            'severity_level': severity_level,
-            'question_type': question_type,
-            'confidence_score': self._calculate_confidence(pain_categories, emotions),
-            'recommendations': recommendations
-        }
+        self.rebuild_automaton()
     
-    def _identify_pain_categories(self, question: str) -> List[str]:
-        """Определяет категории боли"""
-        found_categories = []
-        
+    def rebuild_automaton(self):
+        """Компилирует все словари в один автомат (вызывать после их изменения)"""
+        groups = {}
         for category, keywords in self.pain_keywords.items():
-            if any(keyword in question for keyword in keywords):
-                found_categories.append(category)
+            groups[('боль', category)] = keywords
+        for emotion, markers in self.emotion_markers.items():
+            groups[('эмоция', emotion)] = markers
+        groups['срочность'] = self.context_markers['срочность']
+        groups['низкая срочность'] = self.low_urgency_markers
+        groups['серьезность'] = self.context_markers['важность'] + self.context_markers['влияние']
+        groups['низкая серьезность'] = self.low_severity_markers
+        for question_type, phrases in self.question_type_markers.items():
+            groups[('тип', question_type)] = phrases
         
-        return found_categories
-    
-    def _analyze_emotions(self, question: str) -> List[str]:
-        """Анализирует эмоциональное состояние"""
-        found_emotions = []
+        self._automaton = KeywordAutomaton(groups)
+        bits = self._automaton.bits
         
-        for emotion, markers in self.emotion_markers.items():
-            if any(marker in question for marker in markers):
-                found_emotions.append(emotion)
+        # Категории и эмоции добавлены первыми, поэтому занимают младшие биты подряд:
+        # маски анализа получаются из маски автомата сдвигом
+        self._schema = PainSchema(list(self.pain_keywords), list(self.emotion_markers))
+        self._category_mask = (1 << len(self.pain_keywords)) - 1
+        self._emotion_shift = len(self.pain_keywords)
+        self._emotion_mask = (1 << len(self.emotion_markers)) - 1
         
-        return found_emotions
-    
-    def _analyze_urgency(self, question: str) -> str:
-        """Определяет уровень срочности"""
-        urgency_words = self.context_markers['срочность']
+        self._question_type_bits = [(bits[('тип', question_type)], question_type) for question_type in self.question_type_markers]
+        self._urgency_bit = bits['срочность']
+        self._low_urgency_bit = bits['низкая срочность']
+        self._severity_bit = bits['серьезность']
+        self._low_severity_bit = bits['низкая серьезность']
         
-        if any(word in question for word in urgency_words):
-            return 'высокий'
-        elif 'вчера' in question or 'давно' in question:
-            return 'низкий'
-        else:
-            return 'средний'
+        # Старые результаты посчитаны по прежним словарям
+        self.analysis_cache.invalidate()
+        self._pinned = self._analyze_keys(self._pinned_keys)
     
-    def _analyze_severity(self, question: str) -> str:
-        """Определяет серьезность проблемы"""
-        severity_words = self.context_markers['важность'] + self.context_markers['влияние']
+    def precompute(self, questions: Iterable[str]) -> int:
+        """Заранее анализирует фиксированный корпус (например, рофло-вопросы)
         
-        if any(word in question for word in severity_words):
-            return 'высокая'
-        elif 'может быть' in question or 'возможно' in question:
-            return 'низкая'
-        else:
-            return 'средняя'
+        Анализы попадают в закрепленную таблицу: дальше эти вопросы стоят одного
+        поиска в словаре, а rebuild_automaton пересчитывает таблицу по новым словарям.
+        """
+        self._pinned_keys = list(dict.fromkeys(self._pinned_keys + self._normalize_all(list(questions))))
+        self._pinned = self._analyze_keys(self._pinned_keys)
+        return len(self._pinned)
     
-    def _analyze_question_type(self, question: str) -> str:
-        """Определяет тип вопроса"""
-        if any(word in question for word in ['как', 'что делать', 'помогите', 'подскажите']):
-            return 'просьба о помощи'
-        elif any(word in question for word in ['почему', 'зачем', 'откуда', 'когда']):
-            return 'поиск причины'
-        elif any(word in question for word in ['можно ли', 'стоит ли', 'правильно ли']):
-            return 'поиск подтверждения'
-        elif any(word in question for word in ['что думаете', 'ваше мнение', 'как считаете']):
-            return 'поиск мнения'
-        else:
-            return 'общий вопрос'
+    @property
+    def precomputed_keys(self) -> List[str]:
+        """Нормализованные тексты закрепленного корпуса"""
+        return list(self._pinned_keys)
     
-    def _formulate_main_pain(self, categories: List[str], emotions: List[str], urgency: str, severity: str) -> str:
-        """Формулирует основную боль на основе анализа"""
-        if not categories and not emotions:
-            return "неопределенная потребность в помощи"
+    def analyze_pain(self, question: str) -> PainAnalysis:
+        """Анализирует скрытую боль в вопросе"""
+        key = self._normalize(question)
+        analysis = self._lookup(key)
         
-        pain_description = []
+        if analysis is None:
+            # Все ключевые слова ищутся за один проход автомата
+            analysis = self._analyze_matches(self._automaton.match(key))
+            self.analysis_cache.put(key, analysis)
         
-        if categories:
-            pain_description.append(f"проблема с {', '.join(categories)}")
+        return analysis
+    
+    def analyze_many(self, questions: Iterable[str], lazy: bool = False):
+        """Анализирует пачку вопросов, результаты идут в порядке входа
+        
+        Одинаковые тексты проходят автомат один раз, а анализ строится один раз
+        на каждый набор найденных слов (результаты неизменяемы и разделяются).
+        lazy=True возвращает генератор.
+        """
+        if lazy:
+            return self._iter_analyses(questions)
         
-        if emotions:
-            pain_description.append(f"эмоциональное состояние: {', '.join(emotions)}")
+        keys = self._normalize_all(list(questions))
+        cache = self.analysis_cache
+        results = {}
         
-        if urgency == 'высокий':
-            pain_description.append("высокая срочность решения")
+        # Что уже есть в таблице или кэше, берем оттуда; остальное — одним проходом автомата
+        misses = []
+        for key in dict.fromkeys(keys):
+            analysis = self._lookup(key)
+            if analysis is None:
+                misses.append(key)
+            else:
+                results[key] = analysis
         
-        if severity == 'высокая':
-            pain_description.append("критическая важность")
+        for key, analysis in self._analyze_keys(misses).items():
+            results[key] = analysis
+            cache.put(key, analysis)
         
-        return ". ".join(pain_description)
+        return [results[key] for key in keys]
     
-    def _generate_recommendations(self, categories: List[str], emotions: List[str], question_type: str) -> List[str]:
-        """Генерирует рекомендации на основе анализа"""
-        recommendations = []
+    def _lookup(self, key: str) -> Optional[PainAnalysis]:
+        """Готовый анализ из закрепленной таблицы или кэша (None, если его нет)"""
+        analysis = self._pinned.get(key)
+        if analysis is None:
+            analysis = self.analysis_cache.get(key)
+        return analysis
+    
+    def _analyze_keys(self, keys: List[str]) -> Dict[str, PainAnalysis]:
+        """Прогоняет уникальные ключи через автомат; анализ строится один раз на набор найденных слов"""
+        analyses = {}
+        results = {}
         
-        if 'страх' in categories:
-            recommendations.append("Попробуйте техники дыхания и медитации")
-            recommendations.append("Обратитесь к специалисту по тревожности")
+        for key, matches in zip(keys, self._automaton.match_many(keys)):
+            analysis = analyses.get(matches)
+            if analysis is None:
+                analysis = analyses[matches] = self._analyze_matches(matches)
+            results[key] = analysis
         
-        if 'одиночество' in categories:
-            recommendations.append("Присоединитесь к сообществам по интересам")
-            recommendations.append("Попробуйте новые хобби для знакомств")
+        return results
+    
+    def _normalize(self, question: str) -> str:
+        """Ключ вопроса: нижний регистр без крайних пробелов (на результат анализа не влияет)"""
+        return question.lower().strip()
+    
+    def _normalize_all(self, questions: List[str]) -> List[str]:
+        """Нормализует всю пачку; регистр переводится одним вызовом"""
+        lowered = '\x00'.join(questions).lower().split('\x00')
+        if len(lowered) != len(questions):
+            # Разделитель встретился внутри вопроса
+            lowered = [question.lower() for question in questions]
+        return [question.strip() for question in lowered]
+    
+    def _iter_analyses(self, questions: Iterable[str]) -> Iterator[PainAnalysis]:
+        """Ленивый вариант analyze_many: вопросы читаются по одному"""
+        analyses = {}
         
-        if 'неуверенность' in categories:
-            recommendations.append("Составьте план действий с конкретными шагами")
-            recommendations.append("Начните с малых достижений")
+        for question in questions:
+            key = self._normalize(question)
+            analysis = self._lookup(key)
+            
+            if analysis is None:
+                matches = self._automaton.match(key)
+                analysis = analyses.get(matches)
+                if analysis is None:
+                    analysis = analyses[matches] = self._analyze_matches(matches)
+                self.analysis_cache.put(key, analysis)
+            
+            yield analysis
+    
+    def _analyze_matches(self, matches: int) -> PainAnalysis:
+        """Строит анализ по маске найденных ключевых слов"""
+        # Определяем основные категории боли и эмоциональное состояние
+        categories = matches & self._category_mask
+        emotions = (matches >> self._emotion_shift) & self._emotion_mask
         
-        if 'работа' in categories:
-            recommendations.append("Проанализируйте свои сильные стороны")
-            recommendations.append("Рассмотрите возможности развития")
+        # Определяем уровень срочности
+        urgency_level = self._analyze_urgency(matches)
+        
+        # Определяем серьезность проблемы
+        severity_level = self._analyze_severity(matches)
         
-        if question_type == 'просьба о помощи':
-            recommendations.append("Не бойтесь просить о помощи у близких")
-            recommendations.append("Обратитесь к профессионалам в данной области")
+        # Определяем тип вопроса
+        question_type = self._analyze_question_type(matches)
         
-        if not recommendations:
-            recommendations.append("Попробуйте разбить проблему на части")
-            recommendations.append("Ищите поддержку в сообществах")
+        confidence_score = self._calculate_confidence(self._schema.categories(categories), self._schema.emotions(emotions))
         
-        return recommendations
+        # Основная боль и рекомендации форматируются при обращении
+        return PainAnalysis(self._schema, categories, emotions, urgency_level, severity_level, question_type, confidence_score)
+    
+    def _analyze_urgency(self, matches: int) -> str:
+        """Определяет уровень срочности"""
+        if matches & self._urgency_bit:
+            return 'высокий'
+        elif matches & self._low_urgency_bit:
+            return 'низкий'
+        else:
+            return 'средний'
+    
+    def _analyze_severity(self, matches: int) -> str:
+        """Определяет серьезность проблемы"""
+        if matches & self._severity_bit:
+            return 'высокая'
+        elif matches & self._low_severity_bit:
+            return 'низкая'
+        else:
+            return 'средняя'
+    
+    def _analyze_question_type(self, matches: int) -> str:
+        """Определяет тип вопроса"""
+        for bit, question_type in self._question_type_bits:
+            if matches & bit:
+                return question_type
+        return 'общий вопрос'
     
     def _calculate_confidence(self, categories: List[str], emotions: List[str]) -> float:
         """Рассчитывает уверенность в анализе"""
@@ -0,0 +1 @@
+# Пакетная обработка корпусов вопросов
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from analyzers.pain_analyzer import PainAnalyzer
+from generators.solution_generator import SolutionGenerator
+import config
+
+# Анализатор и генератор процесса-воркера (создаются один раз при его запуске)
+_pain_analyzer: Optional[PainAnalyzer] = None
+_solution_generator: Optional[SolutionGenerator] = None
+
+def _init_worker(seed: Optional[int] = None):
+    """Инициализация процесса-воркера (seed — соль зерен решений вместо config.SOLUTION_SEED)"""
+    global _pain_analyzer, _solution_generator
+    _pain_analyzer = PainAnalyzer()
+    _solution_generator = SolutionGenerator(seed=None if seed is None else str(seed))
+
+def _process_chunk(chunk: List[Tuple[int, Dict]]) -> List[str]:
+    """Обрабатывает кусок вопросов и возвращает готовые строки JSONL"""
+    texts = [record['text'] for _, record in chunk]
+    pain_analyses = _pain_analyzer.analyze_many(texts)
+    # Зерно каждого решения выводится из текста вопроса, а не из того, какой воркер его взял
+    solutions = _solution_generator.generate_many(pain_analyses, texts)
+    lines = []
+    
+    for (line_number, record), pain_analysis, solution in zip(chunk, pain_analyses, solutions):
+        lines.append(json.dumps({
+            'line': line_number,
+            'question': record,
+            'pain_analysis': pain_analysis.to_dict(),
+            'solution': solution
+        }, ensure_ascii=False))
+    
+    return lines
+
+class BatchProcessor:
+    """Пакетный прогон корпуса вопросов (JSONL) через анализ боли и генерацию решений"""
+    
+    def __init__(self, workers: int = None, chunk_size: int = None, seed: int = None):
+        """Инициализация (workers=1 — без пула, в текущем процессе)"""
+        self.workers = workers or config.BATCH_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.BATCH_CHUNK_SIZE
+        self.seed = seed
+    
+    def run(self, input_path: str, output_path: str) -> int:
+        """Обрабатывает входной файл и пишет результаты в порядке входа"""
+        start = time.perf_counter()
+        count = 0
+        
+        with open(input_path, 'r', encoding='utf-8') as source, open(output_path, 'w', encoding='utf-8') as output:
+            for lines in self._process(self._read_chunks(source)):
+                if lines:
+                    output.write('\n'.join(lines) + '\n')
+                    count += len(lines)
+        
+        elapsed = time.perf_counter() - start
+        print(f"✅ Обработано вопросов: {count} за {elapsed:.1f} с ({self.workers} процессов) → {output_path}")
+        return count
+    
+    def _read_chunks(self, source: TextIO) -> Iterator[List[Tuple[int, Dict]]]:
+        """Читает вопросы кусками по chunk_size (строка — JSON-объект с полем text или JSON-строка)"""
+        chunk = []
+        
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                print(f"⚠️ Строка {line_number} пропущена: {e}")
+                continue
+            
+            if isinstance(record, str):
+                record = {'text': record}
+            if not isinstance(record, dict) or not isinstance(record.get('text'), str):
+                print(f"⚠️ Строка {line_number} пропущена: нет поля text")
+                continue
+            
+            chunk.append((line_number, record))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def _process(self, chunks: Iterable[List[Tuple[int, Dict]]]) -> Iterator[List[str]]:
+        """Раздает куски воркерам и отдает результаты в исходном порядке"""
+        if self.workers <= 1:
+            _init_worker(self.seed)
+            for chunk in chunks:
+                yield _process_chunk(chunk)
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.seed,)) as executor:
+            pending = deque()
+            
+            for chunk in chunks:
+                pending.append(executor.submit(_process_chunk, chunk))
+                # Ограничиваем число кусков в работе, чтобы не держать весь корпус в памяти
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            
+            while pending:
+                yield pending.popleft().result()
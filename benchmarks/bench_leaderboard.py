@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк рейтинга: индекс Leaderboard против сортировки на каждый запрос и отсортированного списка
+Запуск: python benchmarks/bench_leaderboard.py [число игроков] [наибольший счет]
+"""
+
+import bisect
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.leaderboard import Leaderboard
+
+class SortedListLeaderboard:
+    """Отсортированный список (-счет, игрок): место бинарным поиском, но вставка O(n)"""
+    
+    def __init__(self, scores):
+        self._scores = dict(scores)
+        self._order = sorted((-score, player) for player, score in self._scores.items())
+    
+    def update(self, player, score):
+        old_score = self._scores.get(player)
+        if old_score is not None:
+            del self._order[bisect.bisect_left(self._order, (-old_score, player))]
+        self._scores[player] = score
+        bisect.insort(self._order, (-score, player))
+    
+    def rank(self, player):
+        return bisect.bisect_left(self._order, (-self._scores[player],)) + 1
+    
+    def top(self, k):
+        return [(player, -score) for score, player in self._order[:k]]
+
+class SortingLeaderboard:
+    """Только словарь счетов: место и топ сортировкой всех игроков на каждый запрос"""
+    
+    def __init__(self, scores):
+        self._scores = dict(scores)
+    
+    def update(self, player, score):
+        self._scores[player] = score
+    
+    def rank(self, player):
+        ordered = sorted(self._scores.values(), reverse=True)
+        return bisect.bisect_left(ordered, -self._scores[player], key=lambda score: -score) + 1
+    
+    def top(self, k):
+        return sorted(self._scores.items(), key=lambda item: -item[1])[:k]
+
+def timed(call, count: int) -> float:
+    """Среднее время вызова в микросекундах"""
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - start) / count * 1e6
+
+def check(leaderboard: Leaderboard, scores: dict, rng: random.Random):
+    """Сверяет место и топ с полной сортировкой"""
+    ordered = sorted(scores.values(), reverse=True)
+    for player in rng.sample(list(scores), 1000):
+        expected = bisect.bisect_left(ordered, -scores[player], key=lambda score: -score) + 1
+        assert leaderboard.rank(player) == expected, f"Неверное место игрока {player}"
+    assert [score for _, score in leaderboard.top(100)] == ordered[:100], "Неверный топ"
+    assert all(scores[player] == score for player, score in leaderboard.top(100)), "Чужой счет в топе"
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_score = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = random.Random(42)
+    scores = {player: int(rng.paretovariate(1.5) * 10) % max_score for player in range(users)}
+    players = list(scores)
+    
+    start = time.perf_counter()
+    leaderboard = Leaderboard(scores.items())
+    build = time.perf_counter() - start
+    print(f"Игроков: {users}, наибольший счет: {max_score}, сборка индекса: {build:.2f} с")
+    
+    check(leaderboard, scores, rng)
+    
+    # Новые лучшие результаты: счет только растет, как best_score в игре
+    def improver(board, board_scores: dict):
+        def improve():
+            player = rng.choice(players)
+            board_scores[player] = min(board_scores[player] + rng.randint(1, 50), max_score)
+            board.update(player, board_scores[player])
+        return improve
+    
+    baselines = (
+        ('Leaderboard', leaderboard, scores, 100_000),
+        ('отсортированный список', SortedListLeaderboard(scores.items()), dict(scores), 2_000),
+        ('сортировка на запрос', SortingLeaderboard(scores.items()), dict(scores), 3)
+    )
+    
+    print(f"\n{'реализация':<24} {'обновление, мкс':>16} {'место, мкс':>14} {'топ-10, мкс':>14}")
+    for label, board, board_scores, count in baselines:
+        update = improver(board, board_scores)
+        rank = lambda: board.rank(rng.choice(players))
+        top = lambda: board.top(10)
+        print(f"{label:<24} {timed(update, count):>16.2f} {timed(rank, count):>14.2f} {timed(top, count):>14.2f}")
+    
+    check(leaderboard, scores, rng)
+    print("\nМеста и топ совпадают с полной сортировкой")
+    
+    # Счет без верхней границы: индекс растет с числом игроков, а не с величиной счета
+    leaderboard.update(players[0], 10 ** 18)
+    assert leaderboard.rank(players[0]) == 1 and leaderboard.top(1) == [(players[0], 10 ** 18)]
+    print("Счет 10^18 не увеличивает индекс: место 1")
+
+if __name__ == "__main__":
+    main()
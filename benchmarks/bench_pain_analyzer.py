@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк PainAnalyzer: автомат Ахо–Корасик и пакетный analyze_many против прежнего поиска подстрок
+Запуск: python benchmarks/bench_pain_analyzer.py [число вопросов]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.pain_analyzer import PainAnalyzer
+from analyzers.analysis_cache import AnalysisCache
+from analyzers.pain_analysis import formulate_main_pain, generate_recommendations
+
+FILLER_WORDS = ['я', 'мой', 'моя', 'работа', 'жизнь', 'день', 'друг', 'мама', 'кот', 'деньги',
+                'в', 'на', 'с', 'и', 'но', 'очень', 'опять', 'снова', 'дома', 'тут']
+
+class ScanPainAnalyzer(PainAnalyzer):
+    """Прежняя реализация: отдельный проход any(слово in вопрос) на каждый словарь"""
+    
+    def analyze_pain(self, question: str):
+        question = question.lower()
+        pain_categories = [category for category, keywords in self.pain_keywords.items()
+                           if any(keyword in question for keyword in keywords)]
+        emotions = [emotion for emotion, markers in self.emotion_markers.items()
+                    if any(marker in question for marker in markers)]
+        
+        if any(word in question for word in self.context_markers['срочность']):
+            urgency_level = 'высокий'
+        elif 'вчера' in question or 'давно' in question:
+            urgency_level = 'низкий'
+        else:
+            urgency_level = 'средний'
+        
+        if any(word in question for word in self.context_markers['важность'] + self.context_markers['влияние']):
+            severity_level = 'высокая'
+        elif 'может быть' in question or 'возможно' in question:
+            severity_level = 'низкая'
+        else:
+            severity_level = 'средняя'
+        
+        if any(word in question for word in ['как', 'что делать', 'помогите', 'подскажите']):
+            question_type = 'просьба о помощи'
+        elif any(word in question for word in ['почему', 'зачем', 'откуда', 'когда']):
+            question_type = 'поиск причины'
+        elif any(word in question for word in ['можно ли', 'стоит ли', 'правильно ли']):
+            question_type = 'поиск подтверждения'
+        elif any(word in question for word in ['что думаете', 'ваше мнение', 'как считаете']):
+            question_type = 'поиск мнения'
+        else:
+            question_type = 'общий вопрос'
+        
+        return {
+            'main_pain': formulate_main_pain(pain_categories, emotions, urgency_level, severity_level),
+            'pain_categories': pain_categories,
+            'emotions': emotions,
+            'urgency_level': urgency_level,
+            'severity_level': severity_level,
+            'question_type': question_type,
+            'confidence_score': self._calculate_confidence(pain_categories, emotions),
+            'recommendations': generate_recommendations(pain_categories, emotions, question_type)
+        }
+
+def generate_questions(analyzer: PainAnalyzer, count: int, seed: int = 42):
+    """Воспроизводимый набор вопросов из ключевых слов анализатора и обычных слов"""
+    rng = random.Random(seed)
+    keywords = [word for words in (list(analyzer.pain_keywords.values()) +
+                                   list(analyzer.emotion_markers.values()) +
+                                   list(analyzer.context_markers.values()) +
+                                   list(analyzer.question_type_markers.values()))
+                for word in words]
+    
+    questions = []
+    for _ in range(count):
+        words = [rng.choice(keywords) if rng.random() < 0.3 else rng.choice(FILLER_WORDS)
+                 for _ in range(rng.randint(4, 14))]
+        questions.append(' '.join(words).capitalize() + '?')
+    return questions
+
+def bench(analyzer: PainAnalyzer, questions) -> float:
+    """Время анализа всех вопросов в секундах"""
+    start = time.perf_counter()
+    for question in questions:
+        analyzer.analyze_pain(question)
+    return time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    analyzer = PainAnalyzer()
+    reference = ScanPainAnalyzer()
+    questions = generate_questions(analyzer, count)
+    
+    for question in questions:
+        assert analyzer.analyze_pain(question) == reference.analyze_pain(question), f"Разный результат: {question}"
+    
+    expected = [reference.analyze_pain(question) for question in questions]
+    assert analyzer.analyze_many(questions) == expected
+    assert list(analyzer.analyze_many(iter(questions), lazy=True)) == expected
+    
+    # Движки сравниваются без кэша результатов
+    analyzer.analysis_cache = AnalysisCache(max_size=0)
+    scan_s = bench(reference, questions)
+    automaton_s = bench(analyzer, questions)
+    start = time.perf_counter()
+    analyzer.analyze_many(questions)
+    batch_s = time.perf_counter() - start
+    
+    # Повторяющиеся вопросы (как рофло-вопросы из раунда в раунд) — через LRU-кэш
+    analyzer.analysis_cache = AnalysisCache()
+    repeated = [questions[index % 500] for index in range(count)]
+    cached_s = bench(analyzer, repeated)
+    
+    print(f"{'движок':<20} {'вопросов':>9} {'время, с':>9} {'вопросов/с':>11}")
+    print(f"{'поиск подстрок':<20} {count:>9} {scan_s:>9.2f} {count / scan_s:>11.0f}")
+    print(f"{'Ахо–Корасик':<20} {count:>9} {automaton_s:>9.2f} {count / automaton_s:>11.0f}")
+    print(f"{'analyze_many':<20} {count:>9} {batch_s:>9.2f} {count / batch_s:>11.0f}")
+    print(f"{'кэш, 500 повторов':<20} {count:>9} {cached_s:>9.2f} {count / cached_s:>11.0f}")
+    print(f"ускорение: {scan_s / automaton_s:.1f}x, пачкой {scan_s / batch_s:.1f}x")
+    print(f"кэш: {analyzer.analysis_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк движков разбора: BeautifulSoup (html.parser), lxml и потоковый lxml
+(проверяет, что на каждой странице все движки дают одинаковые вопросы)
+Запуск: python benchmarks/bench_parser_engines.py [страница.html ...]
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from parsers.question_parser import QuestionParser
+import config
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def bench(func, repeat: int) -> float:
+    """Среднее время одного вызова в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    parser = QuestionParser()
+    extractor = parser._get_lxml_extractor()
+    # Потоковый экстрактор включается флагом PARSER_STREAMING, здесь он нужен всегда
+    config.PARSER_STREAMING = True
+    repeat = 20
+    
+    print(f"{'страница':<28} {'КБ':>6} {'bs4, мс':>9} {'lxml, мс':>9} {'поток, мс':>10} {'ускорение':>10}")
+    
+    for path in paths:
+        with open(path, 'rb') as f:
+            content = f.read()
+        
+        def run_bs4():
+            soup = BeautifulSoup(content, 'html.parser')
+            return parser._extract_questions(soup)
+        
+        def run_lxml():
+            root = extractor.parse(content)
+            return extractor.extract_questions(root, parser._is_question_text, parser._is_question_link)
+        
+        def run_stream(category: str = None):
+            stream = parser._open_stream(category)
+            for start in range(0, len(content), config.PARSER_STREAM_CHUNK_SIZE):
+                if stream.feed(content[start:start + config.PARSER_STREAM_CHUNK_SIZE]):
+                    break
+            return stream.close()
+        
+        # Печать найденных селекторов не должна влиять на замер
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = run_bs4()
+            assert expected == run_lxml(), f"Движки дали разный результат на {path}"
+            # Поток обрывается на PARSER_STREAM_TARGET вопросах: сверяем с началом полного результата
+            assert run_stream() == expected[:config.PARSER_STREAM_TARGET], f"Поток дал другой результат на {path}"
+            for category in parser.game_categories:
+                soup = BeautifulSoup(content, 'html.parser')
+                assert run_stream(category) == parser._extract_questions_by_category(soup, category), \
+                    f"Поток дал другой результат категории {category} на {path}"
+            bs4_ms = bench(run_bs4, repeat)
+            lxml_ms = bench(run_lxml, repeat)
+            stream_ms = bench(run_stream, repeat)
+        
+        print(f"{os.path.basename(path):<28} {len(content) / 1024:>6.0f} {bs4_ms:>9.2f} {lxml_ms:>9.2f} "
+              f"{stream_ms:>10.2f} {bs4_ms / lxml_ms:>9.1f}x")
+    
+    parser.close()
+
+if __name__ == "__main__":
+    main()
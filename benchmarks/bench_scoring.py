@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк скоров: скалярные методы против колоночного расчета на NumPy
+Запуск: python benchmarks/bench_scoring.py [число анализов]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.pain_analyzer import PainAnalyzer
+from generators.solution_generator import SolutionGenerator
+from generators.columnar_scoring import ScoreColumns
+from bench_pain_analyzer import generate_questions
+
+# Урезанные анализы (как заглушки при ошибках в /demo50) проверяют значения по умолчанию
+STUB_ANALYSES = [
+    {'main_pain': 'техническая ошибка', 'confidence_score': 0.1},
+    {'main_pain': 'x', 'emotions': ['страх', 'отчаяние'], 'question_type': 'поиск причины и просьба о помощи'},
+    {'main_pain': 'x', 'confidence_score': 0.7, 'urgency_level': 'низкий', 'severity_level': 'низкая'}
+]
+
+def scalar_scores(analyzer: PainAnalyzer, generator: SolutionGenerator, pain_analyses):
+    """Скалярный путь: по одному анализу за раз"""
+    return [
+        (
+            analyzer._calculate_confidence(analysis.get('pain_categories', []), analysis.get('emotions', [])),
+            generator._calculate_roflo_level(analysis),
+            generator._calculate_startup_potential(analysis),
+            generator._calculate_meme_score(analysis)
+        )
+        for analysis in pain_analyses
+    ]
+
+def columnar_scores(pain_analyses):
+    """Колоночный путь: кодирование и расчет всей пачкой"""
+    columns = ScoreColumns(pain_analyses)
+    roflo_level = columns.roflo_level()
+    return list(zip(
+        columns.confidence_score().tolist(),
+        roflo_level.tolist(),
+        columns.startup_potential(roflo_level),
+        columns.meme_score().tolist()
+    ))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    analyzer = PainAnalyzer()
+    generator = SolutionGenerator()
+    pain_analyses = analyzer.analyze_many(generate_questions(analyzer, count)) + STUB_ANALYSES
+    
+    assert scalar_scores(analyzer, generator, pain_analyses) == columnar_scores(pain_analyses), "Пути дали разные скоры"
+    
+    start = time.perf_counter()
+    scalar_scores(analyzer, generator, pain_analyses)
+    scalar_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    columnar_scores(pain_analyses)
+    columnar_s = time.perf_counter() - start
+    
+    print(f"{'путь':<12} {'анализов':>9} {'время, мс':>10}")
+    print(f"{'скалярный':<12} {len(pain_analyses):>9} {scalar_s * 1000:>10.1f}")
+    print(f"{'NumPy':<12} {len(pain_analyses):>9} {columnar_s * 1000:>10.1f}")
+    print(f"ускорение: {scalar_s / columnar_s:.1f}x")
+
+if __name__ == "__main__":
+    main()
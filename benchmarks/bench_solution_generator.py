@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк SolutionGenerator: скомпилированные шаблоны против сборки списка f-строк на каждый вызов
+Запуск: python benchmarks/bench_solution_generator.py [число вызовов]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.pain_analyzer import PainAnalyzer
+from generators.solution_generator import SolutionGenerator
+from bench_pain_analyzer import generate_questions
+
+class ListSolutionGenerator(SolutionGenerator):
+    """Прежняя реализация: все десять описаний форматируются, чтобы выбрать одно"""
+    
+    def _generate_description(self, pain_analysis: dict, name: str, rng: random.Random = None) -> str:
+        descriptions = [
+            f"{name} — революционная платформа, которая использует передовые технологии ИИ для решения проблем",
+            f"{name} — инновационное решение, объединяющее блокчейн, машинное обучение и облачные вычисления",
+            f"{name} — прорывная система, которая анализирует боль и генерирует персонализированные решения",
+            f"{name} — умная платформа будущего, где технологии встречаются с человеческими потребностями",
+            f"{name} — креативное решение, которое превращает проблемы в возможности для роста",
+            f"{name} — мощный инструмент, использующий big data для анализа и решения сложных задач",
+            f"{name} — интуитивная система, которая понимает твои потребности лучше, чем ты сам",
+            f"{name} — революционный подход к решению повседневных проблем через инновации",
+            f"{name} — умная экосистема, которая адаптируется к твоему образу жизни",
+            f"{name} — прорывная технология, которая делает невозможное возможным"
+        ]
+        return (rng or self.rng).choice(descriptions)
+
+def bench(call, count: int) -> float:
+    """Среднее время вызова в микросекундах"""
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - start) / count * 1e6
+
+def peak_bytes(call, count: int = 1000) -> float:
+    """Средний пик памяти, выделенной за один вызов, в байтах"""
+    tracemalloc.start()
+    total = 0
+    for _ in range(count):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call()
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    analyzer = PainAnalyzer()
+    questions = generate_questions(analyzer, 20_000)
+    pain_analyses = analyzer.analyze_many(questions)
+    generators = [('список f-строк', ListSolutionGenerator()), ('шаблоны', SolutionGenerator())]
+    
+    # Одинаковое зерно — одинаковые решения
+    first, second = (
+        [generator.generate_solution(analysis, rng=random.Random(i)) for i, analysis in enumerate(pain_analyses[:1000])]
+        for _, generator in generators
+    )
+    assert first == second, "Реализации дали разные решения"
+    
+    analysis = pain_analyses[0]
+    print(f"{'реализация':<15} {'описание, мкс':>14} {'пик, Б':>8} {'решение, мкс':>13} {'пик, Б':>8}")
+    for label, generator in generators:
+        generator.rng.seed(42)
+        describe = lambda: generator._generate_description(analysis, "MemePro")
+        solve = lambda: generator.generate_solution(analysis)
+        print(f"{label:<15} {bench(describe, count):>14.2f} {peak_bytes(describe):>8.0f} "
+              f"{bench(solve, count // 4):>13.2f} {peak_bytes(solve):>8.0f}")
+    
+    # Поток решений: цикл generate_solution против generate_many
+    generator = SolutionGenerator()
+    print(f"\n{'поток':<22} {'зерно':<10} {'решений':>8} {'мкс/решение':>12}")
+    for label, seeded in (('без зерна', False), ('по вопросу', True)):
+        texts = questions if seeded else [None] * len(questions)
+        rows = (
+            ('generate_solution', lambda: [generator.generate_solution(analysis, question)
+                                           for analysis, question in zip(pain_analyses, texts)]),
+            ('generate_many', lambda: list(generator.generate_many(pain_analyses, texts if seeded else None)))
+        )
+        for name, run in rows:
+            # Лучший из трех прогонов: на загруженной машине разброс велик
+            elapsed = min(bench(run, 1) for _ in range(3)) / 1e6
+            print(f"{name:<22} {label:<10} {len(pain_analyses):>8} {elapsed / len(pain_analyses) * 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк доставки обновлений: long polling против webhook-сервера на локальном поддельном Bot API
+Запуск: python benchmarks/bench_webhook.py [число обновлений] [задержка сети, мс] [время обработки, мс]
+"""
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import ClientSession, web
+from telegram import Update
+from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram_bot.webhook_server import WebhookServer
+
+TOKEN = '123456:BENCHMARK'
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'update_help.json')
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class FakeTelegramApi:
+    """Поддельный Bot API: getUpdates с долгим опросом, доставка по webhook и запись ответов
+    
+    Каждый ответ API и каждая доставка webhook задерживаются на delay секунд — это
+    односторонняя сетевая задержка до Telegram. Ответ бота в чат отмечает время,
+    когда закончилась обработка обновления этого чата.
+    """
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.port = free_port()
+        self.webhook_url = None
+        self._pending = []
+        self._has_updates = asyncio.Event()
+        self._replies = {}
+        self._next_update_id = 1
+        self._runner = None
+        self._client = None
+        self._webhook_slots = asyncio.Semaphore(40)  # max_connections Telegram по умолчанию
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bot"
+    
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('*', '/bot{token}/{method}', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '127.0.0.1', self.port).start()
+        self._client = ClientSession()
+    
+    async def stop(self):
+        await self._client.close()
+        await self._runner.cleanup()
+    
+    def inject(self, chat_id: int) -> asyncio.Future:
+        """Отправляет боту записанное обновление /help от chat_id; future — время ответа"""
+        with open(FIXTURE, encoding='utf-8') as f:
+            update = json.load(f)
+        update['update_id'] = self._next_update_id
+        self._next_update_id += 1
+        update['message']['chat']['id'] = update['message']['from']['id'] = chat_id
+        
+        reply = asyncio.get_running_loop().create_future()
+        self._replies[chat_id] = reply
+        if self.webhook_url:
+            asyncio.create_task(self._deliver(update))
+        else:
+            self._pending.append(update)
+            self._has_updates.set()
+        return reply
+    
+    async def _deliver(self, update: dict):
+        async with self._webhook_slots:
+            await asyncio.sleep(self.delay)
+            async with self._client.post(self.webhook_url, json=update) as response:
+                assert response.status == 200, f"Webhook ответил {response.status}"
+    
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        params = dict(await request.post())
+        
+        if method == 'getUpdates':
+            offset = int(params.get('offset', 0))
+            self._pending = [update for update in self._pending if update['update_id'] >= offset]
+            if not self._pending:
+                self._has_updates.clear()
+                try:
+                    await asyncio.wait_for(self._has_updates.wait(), float(params.get('timeout', 0)))
+                except asyncio.TimeoutError:
+                    pass
+            result = self._pending[:100]
+        elif method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Магистр', 'username': 'magistr_bench_bot'}
+        elif method == 'sendMessage':
+            chat_id = int(params['chat_id'])
+            reply = self._replies.pop(chat_id, None)
+            if reply is not None and not reply.done():
+                reply.set_result(time.perf_counter())
+            result = {'message_id': 1, 'date': int(time.time()), 'text': params['text'],
+                      'chat': {'id': chat_id, 'type': 'private'}}
+        else:
+            result = True
+        
+        await asyncio.sleep(self.delay)
+        return web.json_response({'ok': True, 'result': result})
+
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Обработчик с имитацией работы (анализ в пуле и т.п.)"""
+    await asyncio.sleep(context.bot_data['work'])
+    await update.message.reply_text("❓ Помощь Магистра")
+
+async def run_mode(mode: str, concurrency: int, count: int, delay: float, work: float) -> dict:
+    fake = FakeTelegramApi(delay)
+    await fake.start()
+    
+    application = Application.builder().token(TOKEN).base_url(fake.base_url).concurrent_updates(concurrency).build()
+    application.bot_data['work'] = work
+    application.add_handler(CommandHandler('help', help_command))
+    await application.initialize()
+    await application.start()
+    
+    server = None
+    if mode == 'webhook':
+        server = WebhookServer(application, host='127.0.0.1', port=free_port(), path='/telegram', secret_token='')
+        await server.start()
+        fake.webhook_url = f"http://127.0.0.1:{server.port}{server.path}"
+    else:
+        await application.updater.start_polling(poll_interval=0.0, timeout=1)
+    
+    # Задержка: обновления по одному, следующее — после ответа на предыдущее
+    latencies = []
+    for chat_id in range(1, 51):
+        start = time.perf_counter()
+        latencies.append((await fake.inject(chat_id)) - start)
+    
+    # Пропускная способность: count обновлений от разных чатов разом
+    start = time.perf_counter()
+    await asyncio.gather(*(fake.inject(1000 + chat_id) for chat_id in range(count)))
+    elapsed = time.perf_counter() - start
+    
+    if server is not None:
+        await server.stop()
+    else:
+        await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    await fake.stop()
+    
+    latencies.sort()
+    return {
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'throughput': count / elapsed
+    }
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    work = (float(sys.argv[3]) if len(sys.argv) > 3 else 5) / 1000
+    print(f"Обновлений: {count}, задержка сети: {delay * 1000:.0f} мс, обработка: {work * 1000:.0f} мс")
+    
+    print(f"\n{'режим':<10} {'одновременно':>12} {'p50, мс':>9} {'p95, мс':>9} {'обновлений/с':>13}")
+    for concurrency in (1, 4, 16):
+        for mode in ('polling', 'webhook'):
+            result = await run_mode(mode, concurrency, count, delay, work)
+            print(f"{mode:<10} {concurrency:>12} {result['p50']:>9.1f} {result['p95']:>9.1f} {result['throughput']:>13.0f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
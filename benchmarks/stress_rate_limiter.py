@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Стресс-тест ограничения частоты: спамер против обычных игроков, места обработки при
+троттлинге, исходящий лимит и размер таблиц
+Запуск: python benchmarks/stress_rate_limiter.py [обычных игроков] [секунд]
+"""
+
+import asyncio
+import copy
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update
+from telegram_bot.rate_limiter import OutboundRateLimiter, UserRateLimiter
+from telegram_bot.update_processor import ChatOrderedUpdateProcessor, update_key
+
+SPAMMER = 0
+PRIVATE_CHAT = 1_000_000
+GROUP_CHAT = -100
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'update_help.json')
+
+def simulate_users(players: int, seconds: int):
+    """Виртуальное время: спамер жмет /demo50 и «Следующий вопрос» 10 раз в секунду,
+    игроки — одно действие раз в 5 секунд"""
+    limiter = UserRateLimiter(max_size=players + 10)
+    outcome = Counter()
+    notices = 0
+    max_wait = 0.0
+    
+    for tick in range(seconds * 10):
+        now = tick / 10
+        for cost_class in ('heavy', 'medium'):
+            wait = limiter.reserve(SPAMMER, cost_class, now)
+            outcome[f"спамер {cost_class}: {'слит' if wait is None else 'выполнен'}"] += 1
+            if wait is None:
+                notices += limiter.should_notify(SPAMMER, now)
+            else:
+                max_wait = max(max_wait, wait)
+        if tick % 50 == 0:
+            for player in range(1, players + 1):
+                wait = limiter.reserve(player, 'medium', now)
+                outcome[f"игроки medium: {'слит' if wait is None else 'выполнен'}"] += 1
+                max_wait = max(max_wait, wait or 0.0)
+    
+    print(f"Пользователи за {seconds} с (лимит ожидания {limiter.max_wait:.0f} с):")
+    for label, count in sorted(outcome.items()):
+        print(f"   {label:<28} {count:>7}")
+    print(f"   предупреждений спамеру        {notices:>7}")
+    print(f"   наибольшее ожидание в очереди {max_wait:>7.1f} с")
+    assert not outcome['игроки medium: слит'], "Обычные игроки не должны упираться в лимит"
+
+async def simulate_throttled(spammers: int, messages: int, concurrency: int):
+    """Реальное время: spammers пользователей шлют по messages сообщений класса medium,
+    часть из них ждет лимита; первое сообщение постороннего не должно ждать мест"""
+    with open(FIXTURE, encoding='utf-8') as f:
+        template = json.load(f)
+    
+    def make_update(update_id: int, user_id: int) -> Update:
+        data = copy.deepcopy(template)
+        data['update_id'] = update_id
+        data['message']['chat']['id'] = data['message']['from']['id'] = user_id
+        return Update.de_json(data, None)
+    
+    limiter = UserRateLimiter()
+    processor = ChatOrderedUpdateProcessor(
+        concurrency, admit=lambda update: limiter.reserve(update_key(update), 'medium')
+    )
+    await processor.initialize()
+    done = {}
+    
+    async def handle(update: Update):
+        await asyncio.sleep(0.005)
+        done[update.update_id] = time.monotonic()
+    
+    updates = [make_update(number * messages + index + 1, 1000 + number)
+               for number in range(spammers) for index in range(messages)]
+    tasks = [asyncio.create_task(processor.process_update(update, handle(update))) for update in updates]
+    await asyncio.sleep(0.2)
+    
+    # Все спамеры уже уперлись в лимит и ждут; приходит посторонний пользователь
+    stats = processor.stats()
+    outsider = make_update(len(updates) + 1, 1)
+    start = time.monotonic()
+    tasks.append(asyncio.create_task(processor.process_update(outsider, handle(outsider))))
+    await asyncio.sleep(0.1)
+    latency = done.get(outsider.update_id, float('inf')) - start
+    
+    await asyncio.gather(*tasks)
+    await processor.shutdown()
+    
+    print(f"\nМеста обработки: {spammers} пользователей по {messages} сообщений, мест {concurrency}")
+    print(f"   пользователей ждут лимита    {stats['active']:>7} (занято мест {stats['running']})")
+    print(f"   слито                        {stats['dropped']:>7}")
+    print(f"   ответ постороннему           {latency * 1000:>7.1f} мс")
+    assert latency < 0.05, "Ожидание лимита не должно занимать места обработки"
+
+async def simulate_outbound(messages: int):
+    """Реальное время: рассылка по многим чатам и поток в один чат"""
+    limiter = OutboundRateLimiter()
+    await limiter.initialize()
+    sent = []
+    
+    async def send(chat_id: int):
+        sent.append((time.monotonic(), chat_id))
+        return True
+    
+    start = time.monotonic()
+    requests = [(chat_id, send) for chat_id in range(1, messages + 1)] + [(GROUP_CHAT, send)] * 5 + [(PRIVATE_CHAT, send)] * 6
+    await asyncio.gather(*(
+        limiter.process_request(callback, (chat_id,), {}, 'sendMessage', {'chat_id': chat_id}, None)
+        for chat_id, callback in requests
+    ))
+    elapsed = time.monotonic() - start
+    
+    # Наибольшее число сообщений в скользящем окне в 1 секунду
+    moments = sorted(moment for moment, _ in sent)
+    peak = 0
+    first = 0
+    for last, moment in enumerate(moments):
+        while moment - moments[first] >= 1:
+            first += 1
+        peak = max(peak, last - first + 1)
+    chat_times = [moment - start for moment, chat_id in sent if chat_id == PRIVATE_CHAT]
+    group_times = [moment - start for moment, chat_id in sent if chat_id == GROUP_CHAT]
+    print(f"\nИсходящие: {len(sent)} сообщений за {elapsed:.1f} с, ждали очереди {limiter.stats()['delayed']}")
+    print(f"   наибольшее число за секунду  {peak:>7} (лимит {limiter.per_second:.0f})")
+    print(f"   личный чат, {len(chat_times)} сообщений      {', '.join(f'{moment:.1f}' for moment in chat_times)} с")
+    print(f"   группа, {len(group_times)} сообщений          {', '.join(f'{moment:.1f}' for moment in group_times)} с")
+    assert len(sent) == len(requests), "Исходящие сообщения не должны теряться"
+    assert peak <= limiter.per_second, "За секунду ушло больше общего лимита"
+
+def check_bounded(users: int, max_size: int):
+    """Таблица бакетов не растет с числом пользователей"""
+    limiter = UserRateLimiter(max_size=max_size)
+    for user in range(users):
+        limiter.reserve(user, 'light', 0.0)
+    print(f"\nПамять: {users} пользователей -> {limiter.stats()['buckets']} бакетов (предел {max_size})")
+    assert limiter.stats()['buckets'] == max_size
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    simulate_users(players, seconds)
+    asyncio.run(simulate_throttled(10, 7, 8))
+    asyncio.run(simulate_outbound(90))
+    check_bounded(100_000, 10_000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Стресс-тест хранилища сессий: вытеснение из LRU, пока обработчик ждет анализа
+Запуск: python benchmarks/stress_session_store.py [пользователей] [размер LRU]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.session_store import SqliteSessionStore
+
+async def handler(store: SqliteSessionStore, user_id: int, refetch: bool, rng: random.Random):
+    """Как analyze_pain_game: сессия берется до await анализа, меняется после"""
+    session = store[user_id]
+    await asyncio.sleep(rng.uniform(0, 0.002))
+    if refetch:
+        session = store[user_id]
+    session['current_analysis'] = f"анализ {session['questions_asked']}"
+    # Как _add_points: сессия берется из хранилища заново
+    store[user_id]['score'] += 10
+    session['questions_asked'] += 1
+
+async def run(users: int, rounds: int, max_size: int, flush_interval: float, refetch: bool) -> int:
+    """Прогоняет раунды всех пользователей вперемешку; возвращает потерянные очки"""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'sessions.db')
+        store = SqliteSessionStore('game_sessions', db_path, max_size=max_size, flush_interval=flush_interval)
+        for user_id in range(users):
+            store[user_id] = {'score': 0, 'questions_asked': 0, 'current_analysis': None}
+        store.start()
+        
+        for _ in range(rounds):
+            order = list(range(users))
+            rng.shuffle(order)
+            await asyncio.gather(*(handler(store, user_id, refetch, rng) for user_id in order))
+        await store.stop()
+        
+        # Читаем из базы новым хранилищем, как после перезапуска бота
+        reopened = SqliteSessionStore('game_sessions', db_path)
+        lost = 0
+        for user_id, session in reopened.scan():
+            lost += rounds * 10 - session['score']
+            assert session['questions_asked'] == rounds, f"Потерян вопрос пользователя {user_id}"
+            assert session['current_analysis'] == f"анализ {rounds - 1}", f"Потерян анализ пользователя {user_id}"
+        await reopened.stop()
+        return lost
+
+async def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    max_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    rounds = 20
+    print(f"Пользователей: {users}, раундов: {rounds}, сессий в памяти: {max_size}")
+    
+    # Без записи в базу во время раундов: вытесненная сессия — живой объект до записи
+    lost = await run(users, rounds, max_size, flush_interval=3600, refetch=False)
+    print(f"   вытеснение во время await           потеряно очков: {lost}")
+    assert lost == 0, "Изменения вытесненной сессии потеряны"
+    
+    # Запись в базу посреди await: обработчик берет сессию заново после ожидания
+    lost = await run(users, rounds, max_size, flush_interval=0.001, refetch=True)
+    print(f"   вытеснение и запись во время await  потеряно очков: {lost}")
+    assert lost == 0, "Изменения сессии, записанной во время await, потеряны"
+    
+    print("\nНи одно изменение сессии не потеряно")
+
+if __name__ == "__main__":
+    asyncio.run(main())
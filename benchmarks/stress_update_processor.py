@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Стресс-тест обработки обновлений: потеря состояния сессий и порядок внутри пользователя
+Запуск: python benchmarks/stress_update_processor.py [пользователей] [обновлений на пользователя] [одновременно] [обновлений/с]
+"""
+
+import asyncio
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update
+from telegram.ext import SimpleUpdateProcessor
+from telegram_bot.update_processor import ChatOrderedUpdateProcessor
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'update_help.json')
+SLOW_USER = 1  # Гоняет /demo50: каждое обновление обрабатывается долго
+
+def make_updates(users: int, per_user: int, rng: random.Random) -> list:
+    """Обновления всех пользователей, перемешанные как при живом трафике"""
+    with open(FIXTURE, encoding='utf-8') as f:
+        template = json.load(f)
+    
+    order = [user for user in range(1, users + 1) for _ in range(per_user)]
+    rng.shuffle(order)
+    updates = []
+    for update_id, user in enumerate(order, 1):
+        data = copy.deepcopy(template)
+        data['update_id'] = update_id
+        data['message']['chat']['id'] = data['message']['from']['id'] = user
+        updates.append(Update.de_json(data, None))
+    return updates
+
+async def handle(update: Update, sessions: dict, latencies: list, received: float, rng: random.Random):
+    """Обработчик как в игре: прочитать сессию, дождаться анализа, записать результат"""
+    user_id = update.effective_user.id
+    session = sessions.setdefault(user_id, {'score': 0, 'seen': []})
+    
+    score = session['score']
+    await asyncio.sleep(0.2 if user_id == SLOW_USER else rng.uniform(0, 0.004))
+    session['score'] = score + 1
+    session['seen'].append(update.update_id)
+    
+    if user_id != SLOW_USER:
+        latencies.append(time.perf_counter() - received)
+
+async def run(processor, updates: list, per_user: int, rate: float) -> dict:
+    """Прогоняет обновления так же, как Application: задача на каждое, в порядке прихода"""
+    rng = random.Random(7)
+    sessions, latencies = {}, []
+    
+    await processor.initialize()
+    start = time.perf_counter()
+    tasks = []
+    for number, update in enumerate(updates):
+        # Обновления приходят потоком с частотой rate; задержка считается от прихода,
+        # даже если обработчик освободился позже
+        received = start + number / rate
+        await asyncio.sleep(max(0.0, received - time.perf_counter()))
+        coroutine = handle(update, sessions, latencies, received, rng)
+        if processor.max_concurrent_updates > 1:
+            tasks.append(asyncio.create_task(processor.process_update(update, coroutine)))
+        else:
+            await processor.process_update(update, coroutine)
+    # Отложенные обновления пользователя дорабатывает задача, занявшая место первой
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    await processor.shutdown()
+    
+    lost = sum(per_user - session['score'] for session in sessions.values())
+    reordered = sum(session['seen'] != sorted(session['seen']) for session in sessions.values())
+    latencies.sort()
+    return {
+        'elapsed': elapsed,
+        'lost': lost,
+        'reordered': reordered,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000
+    }
+
+async def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    rate = float(sys.argv[4]) if len(sys.argv) > 4 else 500
+    updates = make_updates(users, per_user, random.Random(42))
+    print(f"Пользователей: {users}, обновлений: {len(updates)} ({rate:.0f}/с), одновременно: {concurrency}, "
+          f"медленный пользователь: {SLOW_USER}")
+    
+    processors = (
+        ('по одному', SimpleUpdateProcessor(1)),
+        ('параллельно', SimpleUpdateProcessor(concurrency)),
+        ('по пользователям', ChatOrderedUpdateProcessor(concurrency))
+    )
+    print(f"\n{'обработка':<18} {'время, с':>9} {'потеряно очков':>15} {'сессий не по порядку':>21} {'p95 остальных, мс':>18}")
+    for label, processor in processors:
+        result = await run(processor, updates, per_user, rate)
+        print(f"{label:<18} {result['elapsed']:>9.2f} {result['lost']:>15} {result['reordered']:>21} {result['p95']:>18.1f}")
+    
+    assert result['lost'] == 0 and result['reordered'] == 0, "Состояние сессий потеряно"
+    print("\nПо пользователям: ни одно очко не потеряно, порядок внутри каждого пользователя сохранен")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,6 +16,94 @@ REQUEST_TIMEOUT = 10
 MAX_RETRIES = 3
 DELAY_BETWEEN_REQUESTS = 1.0
 
+# Асинхронный парсер (общий пул соединений aiohttp)
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', '4'))
+
+# Дисковый HTTP-кэш страниц (условные запросы, LRU-вытеснение)
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http'))
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(20 * 1024 * 1024)))
+
+# Движок разбора HTML: 'lxml' (быстрый) или 'bs4' (BeautifulSoup, html.parser)
+PARSER_ENGINE = os.getenv('PARSER_ENGINE', 'lxml')
+
+# Потоковый разбор: страница разбирается по мере загрузки и чтение
+# обрывается, как только найдено PARSER_STREAM_TARGET вопросов
+PARSER_STREAMING = os.getenv('PARSER_STREAMING', '0') == '1'
+PARSER_STREAM_TARGET = int(os.getenv('PARSER_STREAM_TARGET', '10'))
+PARSER_STREAM_CHUNK_SIZE = int(os.getenv('PARSER_STREAM_CHUNK_SIZE', str(16 * 1024)))
+
+# Кэш результатов разбора страниц (по хэшу содержимого)
+PARSE_MEMO_SIZE = int(os.getenv('PARSE_MEMO_SIZE', '64'))
+
+# Параллельный опрос всех URL: первый успешный ответ, остальные отменяются
+PARSER_FANOUT = os.getenv('PARSER_FANOUT', '1') == '1'
+PARSER_FANOUT_DEADLINE = float(os.getenv('PARSER_FANOUT_DEADLINE', '5'))  # секунды до рофло-фолбэка
+
+# Пул вопросов (фоновая подгрузка вместо парсинга в обработчиках)
+QUESTION_POOL_SIZE = int(os.getenv('QUESTION_POOL_SIZE', '200'))
+QUESTION_POOL_REFRESH_INTERVAL = float(os.getenv('QUESTION_POOL_REFRESH_INTERVAL', '600'))  # TTL, секунды
+QUESTION_POOL_LOW_WATERMARK = int(os.getenv('QUESTION_POOL_LOW_WATERMARK', '20'))
+
+# LRU-кэш результатов анализа боли (по нормализованному тексту вопроса)
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '2048'))
+
+# Пакетная обработка корпусов (python main.py batch)
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '0'))  # 0 — по числу ядер
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '500'))
+
+# Пул для анализа и генерации вне цикла событий бота
+BOT_EXECUTOR = os.getenv('BOT_EXECUTOR', 'thread')  # thread или process
+BOT_EXECUTOR_WORKERS = int(os.getenv('BOT_EXECUTOR_WORKERS', '2'))
+BOT_EXECUTOR_QUEUE_SIZE = int(os.getenv('BOT_EXECUTOR_QUEUE_SIZE', '32'))  # задач в работе, остальные ждут
+
+# Обработка обновлений и режим webhook (python main.py game --webhook)
+BOT_CONCURRENT_UPDATES = int(os.getenv('BOT_CONCURRENT_UPDATES', '8'))  # пользователей одновременно, у каждого — по порядку
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')  # публичный адрес (https://...), пустой — без setWebhook
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/telegram')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', '')  # проверяется в заголовке X-Telegram-Bot-Api-Secret-Token
+
+# Ограничение частоты команд пользователя: токен-бакеты по классам стоимости
+RATE_LIMIT_HEAVY_PER_MINUTE = float(os.getenv('RATE_LIMIT_HEAVY_PER_MINUTE', '2'))  # /demoN
+RATE_LIMIT_MEDIUM_PER_MINUTE = float(os.getenv('RATE_LIMIT_MEDIUM_PER_MINUTE', '20'))  # парсинг и анализ вопроса
+RATE_LIMIT_LIGHT_PER_MINUTE = float(os.getenv('RATE_LIMIT_LIGHT_PER_MINUTE', '60'))  # меню, статистика, справка
+RATE_LIMIT_CLASSES = {
+    'heavy': (RATE_LIMIT_HEAVY_PER_MINUTE, 2),
+    'medium': (RATE_LIMIT_MEDIUM_PER_MINUTE, 5),
+    'light': (RATE_LIMIT_LIGHT_PER_MINUTE, 10)
+}  # класс -> (запросов в минуту, запас подряд)
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '5'))  # секунд в очереди, дольше — запрос сливается
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', '10000'))  # бакетов в памяти (LRU)
+
+# Исходящие запросы к Bot API (лимиты Telegram на рассылку)
+RATE_OUTBOUND_PER_SECOND = float(os.getenv('RATE_OUTBOUND_PER_SECOND', '30'))
+RATE_OUTBOUND_CHAT_PER_SECOND = float(os.getenv('RATE_OUTBOUND_CHAT_PER_SECOND', '1'))
+RATE_OUTBOUND_GROUP_PER_MINUTE = float(os.getenv('RATE_OUTBOUND_GROUP_PER_MINUTE', '20'))
+RATE_OUTBOUND_MAX_RETRIES = int(os.getenv('RATE_OUTBOUND_MAX_RETRIES', '3'))  # повторов после RetryAfter
+
+# Демонстрация /demoN
+DEMO_DEFAULT_SIZE = 50
+DEMO_MAX_SIZE = int(os.getenv('DEMO_MAX_SIZE', '1000'))
+DEMO_CHUNK_SIZE = int(os.getenv('DEMO_CHUNK_SIZE', '50'))
+DEMO_WORKERS = int(os.getenv('DEMO_WORKERS', '2'))  # кусков одновременно на стадиях анализа и генерации
+DEMO_PROGRESS_INTERVAL = float(os.getenv('DEMO_PROGRESS_INTERVAL', '2'))  # секунды между правками прогресса
+
+# Рейтинг игроков
+LEADERBOARD_SIZE = int(os.getenv('LEADERBOARD_SIZE', '10'))  # игроков в топе кнопки «Лидеры»
+
+# Хранилище сессий ботов
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')  # memory или sqlite
+SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', 'sessions.db')
+SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', '10000'))  # сессий в памяти
+SESSION_IDLE_TTL = float(os.getenv('SESSION_IDLE_TTL', '3600'))  # секунды простоя до вытеснения из памяти
+SESSION_FLUSH_INTERVAL = float(os.getenv('SESSION_FLUSH_INTERVAL', '5'))  # секунды между записями в базу
+SESSION_FLUSH_BATCH = int(os.getenv('SESSION_FLUSH_BATCH', '500'))  # вытесненных до внеочередной записи
+
+# Соль зерен генератора решений: одинаковый вопрос дает одинаковое решение
+SOLUTION_SEED = os.getenv('SOLUTION_SEED', 'magistr')
+
 # Промпты для анализа
 PAIN_ANALYSIS_PROMPT = """
 Проанализируй скрытую боль в вопросе: "{question}"
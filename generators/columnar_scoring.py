@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Dict, List, Sequence
+
+# Коды срочности и серьезности: бонус к уровню рофла равен коду
+URGENCY_CODES = {'высокий': 2, 'средний': 1}
+SEVERITY_CODES = {'высокая': 2, 'средняя': 1}
+
+# Биты эмоций и типов вопроса, влияющих на мемный скор, и их бонусы
+MEME_EMOTION_BONUSES = (('гнев', 20), ('страх', 15), ('отчаяние', 25))
+MEME_QUESTION_TYPE_BONUSES = (('просьба о помощи', 10), ('поиск причины', 5))
+
+# Потенциал стартапа по порогам уровня рофла (от низшего к высшему)
+STARTUP_POTENTIAL_LEVELS = (5, 7, 9)
+STARTUP_POTENTIAL_LABELS = ("🤔 Может быть...", "🎯 Есть потенциал!", "💪 Серийный стартап!", "🚀 Готов к IPO завтра!")
+
+class ScoreColumns:
+    """Колоночный расчет скоров для пачки анализов боли
+    
+    Анализы кодируются в массивы (число индикаторов, уверенность, коды срочности
+    и серьезности, битовые маски эмоций и типа вопроса), а все скоры считаются
+    операциями NumPy над целыми колонками. Результаты совпадают со скалярными
+    PainAnalyzer._calculate_confidence и методами SolutionGenerator.
+    """
+    
+    def __init__(self, pain_analyses: Sequence[Dict]):
+        """Кодирует анализы в колонки за один проход"""
+        indicators, confidence, urgency, severity, emotion_flags, question_type_flags = [], [], [], [], [], []
+        
+        # Различных наборов эмоций и типов вопроса мало: флаги считаются один раз на значение
+        emotion_cache = {}
+        question_type_cache = {}
+        urgency_code = URGENCY_CODES.get
+        severity_code = SEVERITY_CODES.get
+        
+        for analysis in pain_analyses:
+            get = analysis.get
+            emotions = tuple(get('emotions', ()))
+            question_type = get('question_type', '')
+            
+            flags = emotion_cache.get(emotions)
+            if flags is None:
+                flags = emotion_cache[emotions] = self._emotion_flags(emotions)
+            emotion_flags.append(flags)
+            
+            flags = question_type_cache.get(question_type)
+            if flags is None:
+                flags = question_type_cache[question_type] = self._question_type_flags(question_type)
+            question_type_flags.append(flags)
+            
+            indicators.append(len(get('pain_categories', ())) + len(emotions))
+            confidence.append(get('confidence_score', 0.5))
+            urgency.append(urgency_code(get('urgency_level', 'средний'), 0))
+            severity.append(severity_code(get('severity_level', 'средняя'), 0))
+        
+        self.indicators = np.array(indicators, dtype=np.int64)
+        self.confidence = np.array(confidence, dtype=np.float64)
+        self.urgency = np.array(urgency, dtype=np.int64)
+        self.severity = np.array(severity, dtype=np.int64)
+        self.emotion_flags = np.array(emotion_flags, dtype=np.int64)
+        self.question_type_flags = np.array(question_type_flags, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.indicators)
+    
+    @staticmethod
+    def _emotion_flags(emotions) -> int:
+        flags = 0
+        for bit, (emotion, _) in enumerate(MEME_EMOTION_BONUSES):
+            if emotion in emotions:
+                flags |= 1 << bit
+        return flags
+    
+    @staticmethod
+    def _question_type_flags(question_type: str) -> int:
+        flags = 0
+        for bit, (fragment, _) in enumerate(MEME_QUESTION_TYPE_BONUSES):
+            if fragment in question_type:
+                flags |= 1 << bit
+        return flags
+    
+    def confidence_score(self) -> np.ndarray:
+        """Уверенность анализа по числу найденных категорий и эмоций"""
+        indicators = self.indicators
+        return np.select(
+            [indicators == 0, indicators <= 2, indicators <= 4],
+            [0.3, 0.6, 0.8],
+            0.95
+        )
+    
+    def roflo_level(self) -> np.ndarray:
+        """Уровень рофла (1-10)"""
+        confidence = self.confidence
+        confidence_bonus = np.select([confidence > 0.8, confidence > 0.6, confidence > 0.4], [3, 2, 1], 0)
+        return np.minimum(5 + confidence_bonus + self.urgency + self.severity, 10)
+    
+    def startup_potential(self, roflo_level: np.ndarray = None) -> List[str]:
+        """Потенциал стартапа (уровень рофла можно передать, чтобы не считать его заново)"""
+        if roflo_level is None:
+            roflo_level = self.roflo_level()
+        tiers = np.searchsorted(STARTUP_POTENTIAL_LEVELS, roflo_level, side='right')
+        return [STARTUP_POTENTIAL_LABELS[tier] for tier in tiers.tolist()]
+    
+    def meme_score(self) -> np.ndarray:
+        """Мемный скор (1-100)"""
+        score = np.full(len(self), 50, dtype=np.int64)
+        for bit, (_, bonus) in enumerate(MEME_EMOTION_BONUSES):
+            score += ((self.emotion_flags >> bit) & 1) * bonus
+        for bit, (_, bonus) in enumerate(MEME_QUESTION_TYPE_BONUSES):
+            score += ((self.question_type_flags >> bit) & 1) * bonus
+        return np.minimum(score, 100)
+    
+    def scores(self) -> List[Dict[str, object]]:
+        """Скоры решения по строкам (как в generate_solution)"""
+        roflo_level = self.roflo_level()
+        return [
+            {'roflo_level': level, 'startup_potential': potential, 'meme_score': meme}
+            for level, potential, meme in zip(roflo_level.tolist(), self.startup_potential(roflo_level), self.meme_score().tolist())
+        ]
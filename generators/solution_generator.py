@@ -1,8 +1,22 @@
 import random
-from typing import Dict, List
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List
+from generators.columnar_scoring import ScoreColumns
+import config
+
+# Сколько различных анализов generate_many помнит между кусками
+PROFILE_MEMO_LIMIT = 4096
+
+# Конец потока вопросов в generate_many
+_NO_QUESTION = object()
 
 class SolutionGenerator:
-    def __init__(self):
+    def __init__(self, rng: random.Random = None, seed: str = None):
+        # Собственный генератор случайных чисел (глобальный random не используется)
+        self.rng = rng or random.Random()
+        # Соль для зерен, выводимых из текста вопроса (см. rng_for)
+        self.seed = config.SOLUTION_SEED if seed is None else seed
+        
         # Префиксы для названий решений
         self.name_prefixes = [
             "AI", "Smart", "Cloud", "Digital", "Future", "Next", "Pro", "Ultra", "Max", "Elite",
@@ -47,6 +61,20 @@ class SolutionGenerator:
             "IPO через: когда-нибудь в параллельной вселенной!"
         ]
         
+        # Шаблоны описаний решений ({name} — название решения)
+        self.description_templates = [
+            "{name} — революционная платформа, которая использует передовые технологии ИИ для решения проблем",
+            "{name} — инновационное решение, объединяющее блокчейн, машинное обучение и облачные вычисления",
+            "{name} — прорывная система, которая анализирует боль и генерирует персонализированные решения",
+            "{name} — умная платформа будущего, где технологии встречаются с человеческими потребностями",
+            "{name} — креативное решение, которое превращает проблемы в возможности для роста",
+            "{name} — мощный инструмент, использующий big data для анализа и решения сложных задач",
+            "{name} — интуитивная система, которая понимает твои потребности лучше, чем ты сам",
+            "{name} — революционный подход к решению повседневных проблем через инновации",
+            "{name} — умная экосистема, которая адаптируется к твоему образу жизни",
+            "{name} — прорывная технология, которая делает невозможное возможным"
+        ]
+        
         # Категории боли для более точных решений
         self.pain_categories = {
             'страх': ['AI-терапевт страха', 'Страх-анализатор Pro', 'Безопасность-максимум'],
@@ -58,23 +86,100 @@ class SolutionGenerator:
             'технологии': ['Гаджет-синхронизатор', 'Интернет-улучшитель', 'Технология-мастер'],
             'путешествия': ['Путешествие-планировщик', 'Приключение-генератор', 'Мир-открыватель']
         }
+        
+        self.compile_templates()
+    
+    def compile_templates(self):
+        """Компилирует шаблоны описаний и фраз в таблицы (вызывать после их изменения)"""
+        # Шаблон описания разбивается по {name}: при выборе остается один join
+        self._description_table = tuple(tuple(template.split('{name}')) for template in self.description_templates)
+        self._meme_table = tuple(self.meme_elements)
+        self._roflo_table = tuple(self.roflo_phrases)
+    
+    def rng_for(self, question: str, seed: str = None) -> random.Random:
+        """Генератор с зерном из текста вопроса: одинаковые вопросы дают одинаковые решения"""
+        # Строковое зерно хешируется random стабильно, независимо от PYTHONHASHSEED и процесса
+        salt = self.seed if seed is None else seed
+        return random.Random(f"{salt}:{question.lower().strip()}")
+    
+    def generate_solution(self, pain_analysis: dict, question: str = None, rng: random.Random = None) -> dict:
+        """Генерирует SaaS-решение на основе анализа боли
+        
+        Случайность берется из rng, иначе из зерна по тексту question, иначе из self.rng.
+        """
+        if rng is None:
+            rng = self.rng_for(question) if question is not None else self.rng
+        
+        # Уровень рофла нужен и для потенциала стартапа, считаем его один раз
+        roflo_level = self._calculate_roflo_level(pain_analysis)
+        profile = (
+            self._get_main_pain_category(pain_analysis), pain_analysis['main_pain'],
+            roflo_level, self._startup_potential_for_level(roflo_level), self._calculate_meme_score(pain_analysis)
+        )
+        return self._build_solution(pain_analysis, profile, rng)
+    
+    def generate_many(self, pain_analyses: Iterable[dict], questions: Iterable[str] = None,
+                      seed: str = None, chunk_size: int = 256) -> Iterator[dict]:
+        """Генерирует решения для потока анализов (генератор, результаты в порядке входа)
+        
+        С questions зерно каждого решения берется из текста его вопроса (seed заменяет соль
+        self.seed), и результат совпадает с generate_solution(analysis, question). Без
+        questions весь поток использует один Random(seed), а без seed — self.rng.
+        Категория, основная боль и скоры считаются один раз на каждый различный объект
+        анализа (analyze_many разделяет одинаковые), скоры — ScoreColumns кусками по chunk_size.
+        Если вопросов больше или меньше, чем анализов, поднимается ValueError.
+        """
+        if questions is not None:
+            rngs = (self.rng_for(question, seed) for question in questions)
+        else:
+            rngs = repeat(random.Random(seed) if seed is not None else self.rng)
+        
+        analyses = iter(pain_analyses)
+        # id анализа -> (анализ, профиль); ссылка на анализ не дает id переиспользоваться
+        profiles = {}
+        
+        while True:
+            chunk = list(islice(analyses, chunk_size))
+            if not chunk:
+                if questions is not None and next(rngs, _NO_QUESTION) is not _NO_QUESTION:
+                    raise ValueError("Вопросов больше, чем анализов")
+                return
+            
+            if len(profiles) > PROFILE_MEMO_LIMIT:
+                profiles.clear()
+            
+            unseen = list({id(pain_analysis): pain_analysis for pain_analysis in chunk if id(pain_analysis) not in profiles}.values())
+            if unseen:
+                columns = ScoreColumns(unseen)
+                roflo_levels = columns.roflo_level()
+                scores = zip(unseen, roflo_levels.tolist(), columns.startup_potential(roflo_levels), columns.meme_score().tolist())
+                for pain_analysis, roflo_level, startup_potential, meme_score in scores:
+                    profiles[id(pain_analysis)] = (pain_analysis, (
+                        self._get_main_pain_category(pain_analysis), pain_analysis['main_pain'],
+                        roflo_level, startup_potential, meme_score
+                    ))
+            
+            for pain_analysis in chunk:
+                rng = next(rngs, _NO_QUESTION)
+                if rng is _NO_QUESTION:
+                    raise ValueError("Вопросов меньше, чем анализов")
+                yield self._build_solution(pain_analysis, profiles[id(pain_analysis)][1], rng)
     
-    def generate_solution(self, pain_analysis: dict) -> dict:
-        """Генерирует SaaS-решение на основе анализа боли"""
-        # Определяем основную категорию боли
-        main_pain_category = self._get_main_pain_category(pain_analysis)
+    def _build_solution(self, pain_analysis: dict, profile: tuple, rng: random.Random) -> dict:
+        """Собирает решение по готовым категории, основной боли и скорам"""
+        main_pain_category, main_pain, roflo_level, startup_potential, meme_score = profile
         
         # Генерируем название
-        name = self._generate_name(main_pain_category)
+        name = self._generate_name(main_pain_category, rng)
         
         # Генерируем описание
-        description = self._generate_description(pain_analysis, name)
+        description = self._generate_description(pain_analysis, name, rng)
         
         # Генерируем мемный элемент
-        meme_element = random.choice(self.meme_elements)
+        meme_element = rng.choice(self._meme_table)
         
         # Генерируем рофло-фразу
-        roflo_phrase = random.choice(self.roflo_phrases)
+        roflo_phrase = rng.choice(self._roflo_table)
         
         # Формируем полное решение
         full_solution = f"{description} {meme_element}. {roflo_phrase} 🚀"
@@ -85,11 +190,11 @@ class SolutionGenerator:
             'full_solution': full_solution,
             'meme_element': meme_element,
             'roflo_phrase': roflo_phrase,
-            'pain_addressed': pain_analysis['main_pain'],
+            'pain_addressed': main_pain,
             'category': main_pain_category,
-            'roflo_level': self._calculate_roflo_level(pain_analysis),
-            'startup_potential': self._calculate_startup_potential(pain_analysis),
-            'meme_score': self._calculate_meme_score(pain_analysis)
+            'roflo_level': roflo_level,
+            'startup_potential': startup_potential,
+            'meme_score': meme_score
         }
     
     def _get_main_pain_category(self, pain_analysis: dict) -> str:
@@ -106,32 +211,22 @@ class SolutionGenerator:
         
         return 'общие'
     
-    def _generate_name(self, pain_category: str) -> str:
+    def _generate_name(self, pain_category: str, rng: random.Random = None) -> str:
         """Генерирует название решения"""
+        rng = rng or self.rng
         if pain_category in self.pain_categories:
-            return random.choice(self.pain_categories[pain_category])
+            return rng.choice(self.pain_categories[pain_category])
         
-        prefix = random.choice(self.name_prefixes)
-        suffix = random.choice(self.name_suffixes)
+        prefix = rng.choice(self.name_prefixes)
+        suffix = rng.choice(self.name_suffixes)
         
         return f"{prefix}{suffix}"
     
-    def _generate_description(self, pain_analysis: dict, name: str) -> str:
+    def _generate_description(self, pain_analysis: dict, name: str, rng: random.Random = None) -> str:
         """Генерирует описание решения"""
-        descriptions = [
-            f"{name} — революционная платформа, которая использует передовые технологии ИИ для решения проблем",
-            f"{name} — инновационное решение, объединяющее блокчейн, машинное обучение и облачные вычисления",
-            f"{name} — прорывная система, которая анализирует боль и генерирует персонализированные решения",
-            f"{name} — умная платформа будущего, где технологии встречаются с человеческими потребностями",
-            f"{name} — креативное решение, которое превращает проблемы в возможности для роста",
-            f"{name} — мощный инструмент, использующий big data для анализа и решения сложных задач",
-            f"{name} — интуитивная система, которая понимает твои потребности лучше, чем ты сам",
-            f"{name} — революционный подход к решению повседневных проблем через инновации",
-            f"{name} — умная экосистема, которая адаптируется к твоему образу жизни",
-            f"{name} — прорывная технология, которая делает невозможное возможным"
-        ]
-        
-        return random.choice(descriptions)
+        # Собирается только выбранный шаблон: название вставляется между готовыми частями
+        parts = (rng or self.rng).choice(self._description_table)
+        return name.join(parts)
     
     def _calculate_roflo_level(self, pain_analysis: dict) -> int:
         """Рассчитывает уровень рофла (1-10)"""
@@ -166,8 +261,10 @@ class SolutionGenerator:
     
     def _calculate_startup_potential(self, pain_analysis: dict) -> str:
         """Рассчитывает потенциал стартапа"""
-        roflo_level = self._calculate_roflo_level(pain_analysis)
-        
+        return self._startup_potential_for_level(self._calculate_roflo_level(pain_analysis))
+    
+    def _startup_potential_for_level(self, roflo_level: int) -> str:
+        """Потенциал стартапа по уже посчитанному уровню рофла"""
         if roflo_level >= 9:
             return "🚀 Готов к IPO завтра!"
         elif roflo_level >= 7:
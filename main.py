@@ -4,6 +4,7 @@
 Главный оркестратор системы
 """
 
+import argparse
 import asyncio
 import sys
 import os
@@ -17,6 +18,7 @@ from analyzers.pain_analyzer import PainAnalyzer
 from generators.solution_generator import SolutionGenerator
 from telegram_bot.bot import PrometheusBot
 from telegram_bot.game_bot import GamePrometheusBot
+from batch.batch_processor import BatchProcessor
 import config
 
 class PrometheusOrchestrator:
@@ -26,6 +28,8 @@ class PrometheusOrchestrator:
         self.question_parser = QuestionParser()
         self.pain_analyzer = PainAnalyzer()
         self.solution_generator = SolutionGenerator()
+        # Анализ встроенного рофло-корпуса считается один раз при запуске
+        self.pain_analyzer.precompute(self.question_parser.roflo_questions)
         self.stats = {
             'questions_processed': 0,
             'solutions_generated': 0,
@@ -64,7 +68,7 @@ class PrometheusOrchestrator:
             
             # Генерируем решение
             print("💡 Генерирую SaaS-решение...")
-            solution = self.solution_generator.generate_solution(pain_analysis)
+            solution = self.solution_generator.generate_solution(pain_analysis, question_data['text'])
             
             print(f"🚀 **{solution['name']}**")
             print(f"💡 **Решение:** {solution['full_solution']}")
@@ -102,17 +106,50 @@ class PrometheusOrchestrator:
         finally:
             self.question_parser.close()
     
-    def run_telegram_bot(self):
+    def run_telegram_bot(self, args: list = None):
         """Запускает обычного Telegram-бота"""
+        options = self._parse_bot_args('main.py bot', args or [])
         print("🤖 Запускаю обычного Telegram-бота...")
         bot = PrometheusBot()
-        bot.run()
+        bot.run(webhook=options.webhook)
     
-    def run_game_bot(self):
+    def run_game_bot(self, args: list = None):
         """Запускает игрового Telegram-бота"""
+        options = self._parse_bot_args('main.py game', args or [])
         print("🎮 Запускаю игрового Telegram-бота...")
         bot = GamePrometheusBot()
-        bot.run()
+        bot.run(webhook=options.webhook)
+    
+    def _parse_bot_args(self, prog: str, args: list) -> argparse.Namespace:
+        """Разбирает ключи запуска бота"""
+        arg_parser = argparse.ArgumentParser(prog=prog, description='Запуск Telegram-бота')
+        arg_parser.add_argument('--webhook', action='store_true',
+                                help='принимать обновления встроенным HTTP-сервером вместо long polling')
+        arg_parser.add_argument('--port', type=int, help='порт webhook-сервера (по умолчанию WEBHOOK_PORT)')
+        options = arg_parser.parse_args(args)
+        if options.port is not None:
+            config.WEBHOOK_PORT = options.port
+        return options
+    
+    def run_batch(self, args: list):
+        """Пакетно обрабатывает корпус вопросов из JSONL"""
+        arg_parser = argparse.ArgumentParser(prog='main.py batch', description='Пакетный анализ вопросов из JSONL')
+        arg_parser.add_argument('--input', required=True, help='входной JSONL (объекты с полем text или строки)')
+        arg_parser.add_argument('--output', help='выходной JSONL (по умолчанию <input>.results.jsonl)')
+        arg_parser.add_argument('--workers', type=int, help='число процессов (по умолчанию по числу ядер)')
+        arg_parser.add_argument('--chunk-size', type=int, help='вопросов в одном куске для воркера')
+        arg_parser.add_argument('--seed', type=int, help='соль зерен решений (по умолчанию SOLUTION_SEED)')
+        options = arg_parser.parse_args(args)
+        
+        output = options.output or f"{os.path.splitext(options.input)[0]}.results.jsonl"
+        print(f"📦 Пакетная обработка: {options.input}")
+        
+        processor = BatchProcessor(workers=options.workers, chunk_size=options.chunk_size, seed=options.seed)
+        count = processor.run(options.input, output)
+        
+        self.stats['questions_processed'] += count
+        self.stats['pain_analyses'] += count
+        self.stats['solutions_generated'] += count
     
     def run_interactive_mode(self):
         """Запускает интерактивный режим"""
@@ -214,7 +251,7 @@ class PrometheusOrchestrator:
         
         if not self._current_solution:
             print("💡 Генерирую SaaS-решение...")
-            solution = self.solution_generator.generate_solution(self._current_pain_analysis)
+            solution = self.solution_generator.generate_solution(self._current_pain_analysis, self._current_question['text'])
             self._current_solution = solution
             
             print(f"🚀 **{solution['name']}**")
@@ -267,15 +304,18 @@ def main():
             orchestrator.run_cli_demo()
         elif mode == "bot":
             orchestrator = PrometheusOrchestrator()
-            orchestrator.run_telegram_bot()
+            orchestrator.run_telegram_bot(sys.argv[2:])
         elif mode == "game":
             orchestrator = PrometheusOrchestrator()
-            orchestrator.run_game_bot()
+            orchestrator.run_game_bot(sys.argv[2:])
         elif mode == "interactive":
             orchestrator = PrometheusOrchestrator()
             orchestrator.run_interactive_mode()
+        elif mode == "batch":
+            orchestrator = PrometheusOrchestrator()
+            orchestrator.run_batch(sys.argv[2:])
         else:
-            print("❌ Неверный режим. Используйте: cli, bot, game, или interactive")
+            print("❌ Неверный режим. Используйте: cli, bot, game, interactive или batch")
     else:
         # По умолчанию запускаем интерактивный режим
         orchestrator = PrometheusOrchestrator()
@@ -0,0 +1,57 @@
+import aiohttp
+from typing import Awaitable, Callable, Dict, Mapping, Optional, Tuple
+import config
+
+class AsyncFetcher:
+    """Асинхронный загрузчик страниц с общим пулом соединений"""
+    
+    def __init__(self, headers: Dict[str, str], pool_size: int = None, limit_per_host: int = None):
+        """Инициализация загрузчика (сессия создается лениво внутри event loop)"""
+        self.headers = dict(headers)
+        self.pool_size = pool_size or config.HTTP_POOL_SIZE
+        self.limit_per_host = limit_per_host or config.HTTP_LIMIT_PER_HOST
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Общая ClientSession с ограниченным пулом соединений"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        return self._session
+    
+    async def fetch(self, url: str, timeout: float, headers: Dict[str, str] = None) -> Tuple[int, Mapping[str, str], bytes]:
+        """Загружает страницу и возвращает статус, заголовки (без учета регистра) и тело ответа"""
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.get(url, timeout=client_timeout, headers=headers) as response:
+            response.raise_for_status()
+            body = b'' if response.status == 304 else await response.read()
+            return response.status, response.headers.copy(), body
+    
+    async def stream(self, url: str, timeout: float, open_consumer: Callable[[Optional[str]], Callable[[bytes], Awaitable[bool]]],
+                     headers: Dict[str, str] = None) -> int:
+        """Читает ответ кусками и возвращает статус
+        
+        open_consumer(кодировка) вызывается перед чтением тела и возвращает корутинную
+        функцию, которая получает куски; как только она вернет True, чтение прекращается.
+        """
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.get(url, timeout=client_timeout, headers=headers) as response:
+            response.raise_for_status()
+            if response.status != 304:
+                on_chunk = open_consumer(response.charset)
+                async for chunk in response.content.iter_chunked(config.PARSER_STREAM_CHUNK_SIZE):
+                    if await on_chunk(chunk):
+                        # Выход из контекста закрывает соединение с недочитанным телом
+                        break
+            return response.status
+    
+    async def close(self):
+        """Закрывает сессию и освобождает соединения"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
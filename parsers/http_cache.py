@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+import config
+
+class HTTPCache:
+    """Дисковый кэш страниц с валидаторами ETag/Last-Modified и LRU-вытеснением
+    
+    Индекс хранит только валидаторы и хэши тел и переписывается один раз на
+    сохраненную страницу. Асинхронный API парсера вызывает запись и чтение
+    из своего потока разбора, а не из цикла событий.
+    """
+    
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        """Инициализация кэша и загрузка индекса с диска"""
+        self.directory = directory or config.HTTP_CACHE_DIR
+        self.max_bytes = max_bytes or config.HTTP_CACHE_MAX_BYTES
+        self._index_path = os.path.join(self.directory, 'index.json')
+        
+        # url -> {file, etag, last_modified, size, sha1}; порядок = порядок LRU
+        self._entries: OrderedDict = OrderedDict()
+        self._load_index()
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Возвращает заголовки условного запроса для закэшированной страницы"""
+        entry = self._entries.get(url)
+        headers = {}
+        
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        
+        return headers
+    
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """Сохраняет тело ответа вместе с валидаторами"""
+        if not etag and not last_modified:
+            # Без валидаторов условный запрос невозможен, кэшировать нечего
+            self.invalidate(url)
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            f.write(body)
+        
+        self._entries[url] = {
+            'file': filename,
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': len(body),
+            'sha1': hashlib.sha1(body).hexdigest()
+        }
+        self._entries.move_to_end(url)
+        self._evict()
+        self._save_index()
+    
+    def load(self, url: str) -> Optional[bytes]:
+        """Читает закэшированное тело страницы"""
+        entry = self._touch(url)
+        if not entry:
+            return None
+        
+        try:
+            with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+                return f.read()
+        except OSError:
+            self.invalidate(url)
+            return None
+    
+    def digest(self, url: str) -> Optional[str]:
+        """Возвращает SHA-1 закэшированного тела (ключ результатов разбора в ParseMemo)"""
+        entry = self._touch(url)
+        if not entry:
+            return None
+        return entry.get('sha1')
+    
+    def invalidate(self, url: str):
+        """Удаляет страницу из кэша"""
+        entry = self._entries.pop(url, None)
+        if entry:
+            self._remove_file(entry)
+            self._save_index()
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self._entries.values())
+    
+    def _touch(self, url: str) -> Optional[Dict]:
+        """Отмечает страницу как недавно использованную"""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+    
+    def _evict(self):
+        """Вытесняет давно не использованные страницы сверх лимита"""
+        total = self.total_bytes
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= entry['size']
+            self._remove_file(entry)
+    
+    def _remove_file(self, entry: Dict):
+        try:
+            os.remove(os.path.join(self.directory, entry['file']))
+        except OSError:
+            pass
+    
+    def _load_index(self):
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                for url, entry in json.load(f):
+                    self._entries[url] = entry
+        except (OSError, ValueError):
+            self._entries.clear()
+    
+    def _save_index(self):
+        """Атомарно записывает индекс (порядок LRU сохраняется)"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self._entries.items()), f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path)
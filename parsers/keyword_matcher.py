@@ -0,0 +1,17 @@
+import re
+from typing import Iterable
+
+class KeywordMatcher:
+    """Проверка «текст содержит хотя бы одно из слов» одним скомпилированным регулярным выражением"""
+    
+    def __init__(self, words: Iterable[str]):
+        """Компилирует альтернацию из слов (длинные слова идут первыми)"""
+        self.words = tuple(words)
+        unique = sorted(set(self.words), key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(word) for word in unique)) if unique else None
+    
+    def matches(self, text: str) -> bool:
+        """Аналог any(word in text.lower() for word in words)"""
+        if self._pattern is None:
+            return False
+        return self._pattern.search(text.lower()) is not None
@@ -0,0 +1,155 @@
+import re
+from lxml import etree
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+SELECTOR_LIMIT = 15  # элементов селектора, проверяемых на вопрос
+LINK_LIMIT = 10  # вопросов из ссылок, если селекторы ничего не дали
+
+# Простой CSS-селектор: тег, классы и атрибуты ([attr], [attr="v"], [attr*="v"], [attr^="v"])
+_COMPOUND_RE = re.compile(r'^(?P<tag>[a-zA-Z][a-zA-Z0-9]*|\*)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$')
+_PART_RE = re.compile(
+    r'\.(?P<cls>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^]?=)\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<bare>[^\]\s"\']+))\s*)?\]'
+)
+
+def _xpath_literal(value: str) -> str:
+    """Строковый литерал XPath 1.0"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+def _compound_to_step(compound: str) -> str:
+    """Переводит простой селектор (без комбинаторов) в шаг XPath"""
+    match = _COMPOUND_RE.match(compound)
+    if not match or not (match.group('tag') or match.group('rest')):
+        raise ValueError(f"Неподдерживаемый селектор: {compound}")
+    
+    rest = match.group('rest') or ''
+    parts = list(_PART_RE.finditer(rest))
+    if sum(len(part.group(0)) for part in parts) != len(rest):
+        raise ValueError(f"Неподдерживаемый селектор: {compound}")
+    
+    conditions = []
+    for part in parts:
+        if part.group('cls'):
+            conditions.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), ' {part.group('cls')} ')"
+            )
+        elif part.group('op') is None:
+            conditions.append(f"@{part.group('attr')}")
+        else:
+            attr = part.group('attr')
+            raw_value = next(v for v in (part.group('dq'), part.group('sq'), part.group('bare')) if v is not None)
+            value = _xpath_literal(raw_value)
+            if part.group('op') == '=':
+                conditions.append(f"@{attr} = {value}")
+            elif part.group('op') == '*=':
+                conditions.append(f"contains(@{attr}, {value})")
+            else:
+                conditions.append(f"starts-with(@{attr}, {value})")
+    
+    step = (match.group('tag') or '*').lower()
+    return step + ''.join(f"[{condition}]" for condition in conditions)
+
+def css_to_xpath_step(selector: str) -> str:
+    """Переводит CSS-селектор с комбинаторами ' ' и '>' в шаг XPath
+    
+    Предки выражаются предикатами (ancestor::/parent::), поэтому шаг годится
+    и для поиска по документу ('//' + шаг), и для проверки элемента ('self::' + шаг).
+    """
+    tokens = selector.replace('>', ' > ').split()
+    if not tokens or tokens[0] == '>' or tokens[-1] == '>':
+        raise ValueError(f"Неподдерживаемый селектор: {selector}")
+    
+    step = None
+    axis = 'ancestor'
+    for token in tokens:
+        if token == '>':
+            axis = 'parent'
+            continue
+        
+        compound = _compound_to_step(token)
+        # Условие на предка вкладывается в следующий шаг: a[ancestor::h2[...]]
+        step = compound if step is None else f"{compound}[{axis}::{step}]"
+        axis = 'ancestor'
+    
+    return step
+
+def selector_key(selector: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Тег и классы последнего простого селектора: элемент без них селектору не подходит"""
+    compound = selector.replace('>', ' > ').split()[-1]
+    match = _COMPOUND_RE.match(compound)
+    if not match:
+        raise ValueError(f"Неподдерживаемый селектор: {selector}")
+    tag = match.group('tag')
+    classes = tuple(part.group('cls') for part in _PART_RE.finditer(match.group('rest') or '') if part.group('cls'))
+    return (tag.lower() if tag and tag != '*' else None), classes
+
+class LxmlExtractor:
+    """Быстрое извлечение вопросов: один разбор lxml и заранее скомпилированные XPath"""
+    
+    def __init__(self, selectors: Sequence[str]):
+        """Компилирует селекторы (ValueError, если какой-то не поддерживается)"""
+        self.selectors = tuple(selectors)
+        self._queries = [(selector, etree.XPath('//' + css_to_xpath_step(selector))) for selector in self.selectors]
+        self._links = etree.XPath('//a[@href]')
+        # Как get_text в BeautifulSoup: содержимое script и style в текст не входит
+        self._texts = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+        self._utf8_parser = etree.HTMLParser(encoding='utf-8')
+        self._parser = etree.HTMLParser()
+    
+    def parse(self, content: bytes):
+        """Разбирает страницу в дерево lxml"""
+        try:
+            content.decode('utf-8')
+            parser = self._utf8_parser
+        except UnicodeDecodeError:
+            # Пусть libxml2 сам определит кодировку по meta
+            parser = self._parser
+        
+        root = etree.fromstring(content, parser)
+        if root is None:
+            raise ValueError("Пустой документ")
+        return root
+    
+    def text(self, element) -> str:
+        """Аналог BeautifulSoup get_text(strip=True)"""
+        return ''.join(text.strip() for text in self._texts(element))
+    
+    def extract_questions(self, root, is_question: Callable[[str], bool], is_link_question: Callable[[str], bool]) -> List[Dict[str, str]]:
+        """Извлекает вопросы по селекторам в порядке приоритета, затем по ссылкам"""
+        for selector, query in self._queries:
+            elements = query(root)
+            if elements:
+                print(f"🔍 Найден селектор: {selector} ({len(elements)} элементов)")
+                questions = []
+                for element in elements[:SELECTOR_LIMIT]:
+                    text = self.text(element)
+                    if is_question(text):
+                        questions.append({
+                            'text': text,
+                            'source': 'Answer Mail.ru'
+                        })
+                if questions:
+                    return questions
+        
+        return self.extract_links(root, is_link_question)
+    
+    def extract_links(self, root, predicate: Callable[[str], bool], limit: int = LINK_LIMIT) -> List[Dict[str, str]]:
+        """Извлекает вопросы из текстов ссылок"""
+        questions = []
+        
+        for link in self._links(root):
+            text = self.text(link)
+            if predicate(text):
+                questions.append({
+                    'text': text,
+                    'source': 'Answer Mail.ru'
+                })
+                if len(questions) >= limit:
+                    break
+        
+        return questions
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+import config
+
+class ParseMemo:
+    """Ограниченный LRU-кэш результатов разбора страниц по хэшу содержимого"""
+    
+    def __init__(self, max_size: int = None):
+        """Инициализация кэша"""
+        self.max_size = max_size or config.PARSE_MEMO_SIZE
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[List[Dict[str, str]]]:
+        """Возвращает копию сохраненного списка вопросов или None"""
+        questions = self._entries.get(key)
+        
+        if questions is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return list(questions)
+    
+    def put(self, key: Hashable, questions: List[Dict[str, str]]):
+        """Сохраняет результат разбора, вытесняя самые старые записи"""
+        self._entries[key] = tuple(questions)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self):
+        """Сбрасывает все записи (например, после смены селекторов)"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика попаданий и промахов"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -1,22 +1,52 @@
+import asyncio
+import hashlib
 import requests
 import random
 import time
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Mapping, Optional
+from parsers.async_fetcher import AsyncFetcher
+from parsers.http_cache import HTTPCache
+from parsers.lxml_extractor import LxmlExtractor
+from parsers.streaming_extractor import StreamingExtractor, charset_from_content_type
+from parsers.keyword_matcher import KeywordMatcher
+from parsers.parse_memo import ParseMemo
 import config
 
 class QuestionParser:
     def __init__(self):
         """Инициализация парсера"""
-        self.session = requests.Session()
-        self.session.headers.update({
+        headers = {
             'User-Agent': config.USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        
+        # Асинхронный загрузчик для бота (не блокирует event loop)
+        self.async_fetcher = AsyncFetcher(headers)
+        
+        # Дисковый кэш страниц для условных запросов (ETag/Last-Modified)
+        self.http_cache = HTTPCache()
+        
+        # Кэш результатов разбора по хэшу содержимого страницы
+        self.parse_memo = ParseMemo()
+        
+        # Поток для разбора в асинхронном API (создается лениво): один, поэтому
+        # разборы идут по очереди и не делят кэши и экстракторы между потоками
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Быстрый экстрактор на lxml (компилируется лениво под текущие селекторы)
+        self._lxml_extractor = None
+        self._lxml_selectors = None
+        self._streaming_extractor = None
+        self._streaming_selectors = None
         
         # Альтернативные URL для парсинга
         self.urls = [
@@ -36,6 +66,34 @@ class QuestionParser:
             'путешествия': ['путешествие', 'отпуск', 'поездка', 'страна', 'город', 'билеты', 'отель', 'чемодан']
         }
         
+        # Слова, по которым текст считается вопросом (для ссылок список шире)
+        self.question_words = ['как', 'что', 'где', 'когда', 'почему', 'зачем', 'можно ли', 'стоит ли']
+        self.link_question_words = self.question_words + ['помогите', 'подскажите']
+        
+        # Фильтры компилируются один раз и общие для всех экстракторов
+        self._question_matcher = KeywordMatcher(self.question_words)
+        self._link_question_matcher = KeywordMatcher(self.link_question_words)
+        self._category_matchers: Dict[str, KeywordMatcher] = {}
+        
+        # Расширенный список селекторов для поиска вопросов
+        self.selectors = [
+            '.question__text',
+            '.question-title',
+            '.question',
+            'h2 a',
+            '.qa-item__title',
+            '.question-item__title',
+            '.question-item__text',
+            '.qa-question__title',
+            '.qa-question__text',
+            'h3 a',
+            'h4 a',
+            '.title a',
+            '.text a',
+            'a[href*="question"]',
+            'a[href*="answer"]'
+        ]
+        
         # Рофло-вопросы для разнообразия
         self.roflo_questions = [
             "Почему мой холодильник не понимает мои эмоции?",
@@ -97,19 +155,10 @@ class QuestionParser:
         # Сначала пробуем получить реальный вопрос
         for url in self.urls:
             try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                questions = self._extract_questions(soup)
+                questions = self._fetch_questions(url, timeout=15)
                 
                 if questions:
-                    question = random.choice(questions)
-                    return {
-                        'text': question['text'],
-                        'source': 'Answer Mail.ru',
-                        'type': 'real'
-                    }
+                    return self._make_real_question(random.choice(questions))
                     
             except Exception as e:
                 continue
@@ -117,6 +166,46 @@ class QuestionParser:
         # Если не удалось получить реальный вопрос, возвращаем рофло-вопрос
         return self.get_roflo_question()
     
+    async def aget_random_question(self, fanout: bool = None) -> Optional[Dict[str, str]]:
+        """Асинхронно получает случайный вопрос с Answer Mail.ru"""
+        if config.PARSER_FANOUT if fanout is None else fanout:
+            questions = await self._afetch_first_questions()
+            
+            if questions:
+                return self._make_real_question(random.choice(questions))
+            return self.get_roflo_question()
+        
+        for url in self.urls:
+            try:
+                questions = await self._afetch_questions(url, timeout=15)
+                
+                if questions:
+                    return self._make_real_question(random.choice(questions))
+                    
+            except Exception as e:
+                continue
+        
+        return self.get_roflo_question()
+    
+    async def afetch_real_questions(self) -> List[Dict[str, str]]:
+        """Асинхронно загружает все URL сразу и собирает уникальные реальные вопросы"""
+        results = await asyncio.gather(
+            *(self._afetch_questions(url, timeout=15) for url in self.urls),
+            return_exceptions=True
+        )
+        
+        questions = []
+        seen = set()
+        for result in results:
+            if isinstance(result, Exception):
+                continue
+            for question in result:
+                if question['text'] not in seen:
+                    seen.add(question['text'])
+                    questions.append(self._make_real_question(question))
+        
+        return questions
+    
     def get_roflo_question(self) -> Dict[str, str]:
         """Получает случайный рофло-вопрос"""
         question = random.choice(self.roflo_questions)
@@ -128,41 +217,16 @@ class QuestionParser:
     
     def get_multiple_questions(self, count: int = 10) -> List[Dict[str, str]]:
         """Получает несколько вопросов для демонстрации"""
-        questions = []
-        
-        # Добавляем рофло-вопросы
-        roflo_count = min(count // 2, len(self.roflo_questions))
-        roflo_selection = random.sample(self.roflo_questions, roflo_count)
-        
-        for question in roflo_selection:
-            questions.append({
-                'text': question,
-                'source': 'Рофло-генератор',
-                'type': 'roflo'
-            })
+        questions = self._roflo_selection(count)
         
         # Пытаемся добавить реальные вопросы
         try:
             for url in self.urls[:2]:  # Берем только первые 2 URL
                 try:
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    real_questions = self._extract_questions(soup)
+                    real_questions = self._fetch_questions(url, timeout=10)
                     
                     if real_questions:
-                        # Берем случайные реальные вопросы
-                        real_count = min(count - len(questions), len(real_questions))
-                        real_selection = random.sample(real_questions, real_count)
-                        
-                        for question in real_selection:
-                            questions.append({
-                                'text': question['text'],
-                                'source': 'Answer Mail.ru',
-                                'type': 'real'
-                            })
-                        
+                        self._add_real_selection(questions, real_questions, count)
                         break
                         
                 except Exception:
@@ -171,7 +235,46 @@ class QuestionParser:
         except Exception:
             pass
         
-        # Если вопросов все еще мало, добавляем еще рофло
+        return self._fill_with_roflo(questions, count)
+    
+    async def aget_multiple_questions(self, count: int = 10) -> List[Dict[str, str]]:
+        """Асинхронно получает несколько вопросов для демонстрации"""
+        questions = self._roflo_selection(count)
+        
+        for url in self.urls[:2]:
+            try:
+                real_questions = await self._afetch_questions(url, timeout=10)
+                
+                if real_questions:
+                    self._add_real_selection(questions, real_questions, count)
+                    break
+                    
+            except Exception:
+                continue
+        
+        return self._fill_with_roflo(questions, count)
+    
+    def _roflo_selection(self, count: int) -> List[Dict[str, str]]:
+        """Выбирает рофло-вопросы для первой половины демонстрации"""
+        roflo_count = min(count // 2, len(self.roflo_questions))
+        roflo_selection = random.sample(self.roflo_questions, roflo_count)
+        
+        return [{
+            'text': question,
+            'source': 'Рофло-генератор',
+            'type': 'roflo'
+        } for question in roflo_selection]
+    
+    def _add_real_selection(self, questions: List[Dict[str, str]], real_questions: List[Dict[str, str]], count: int):
+        """Добавляет случайные реальные вопросы до нужного количества"""
+        real_count = min(count - len(questions), len(real_questions))
+        real_selection = random.sample(real_questions, real_count)
+        
+        for question in real_selection:
+            questions.append(self._make_real_question(question))
+    
+    def _fill_with_roflo(self, questions: List[Dict[str, str]], count: int) -> List[Dict[str, str]]:
+        """Добивает список рофло-вопросами, если вопросов все еще мало"""
         while len(questions) < count:
             roflo_question = random.choice(self.roflo_questions)
             if not any(q['text'] == roflo_question for q in questions):
@@ -197,20 +300,32 @@ class QuestionParser:
             # Ищем вопросы с ключевыми словами категории
             for url in self.urls:
                 try:
-                    response = self.session.get(url, timeout=15)
-                    response.raise_for_status()
+                    questions = self._fetch_questions(url, timeout=15, category=category)
                     
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    questions = self._extract_questions_by_category(soup, category)
+                    if questions:
+                        return self._make_category_question(random.choice(questions), category)
+                        
+                except Exception as e:
+                    continue
+        
+        return None
+    
+    async def aget_question_by_category(self, category: str, fanout: bool = None) -> Optional[Dict[str, str]]:
+        """Асинхронно получает вопрос по игровой категории"""
+        if category.lower() in self.game_categories:
+            if config.PARSER_FANOUT if fanout is None else fanout:
+                questions = await self._afetch_first_questions(category=category)
+                
+                if questions:
+                    return self._make_category_question(random.choice(questions), category)
+                return None
+            
+            for url in self.urls:
+                try:
+                    questions = await self._afetch_questions(url, timeout=15, category=category)
                     
                     if questions:
-                        question = random.choice(questions)
-                        return {
-                            'text': question['text'],
-                            'source': 'Answer Mail.ru',
-                            'type': 'category',
-                            'category': category
-                        }
+                        return self._make_category_question(random.choice(questions), category)
                         
                 except Exception as e:
                     continue
@@ -224,43 +339,298 @@ class QuestionParser:
         else:
             return self.get_random_question()
     
+    async def aget_random_question_by_category(self, category: str = None) -> Optional[Dict[str, str]]:
+        """Асинхронно получает случайный вопрос по категории или общий"""
+        if category and category.lower() in self.game_categories:
+            return await self.aget_question_by_category(category)
+        else:
+            return await self.aget_random_question()
+    
+    def _fetch_questions(self, url: str, timeout: float, category: str = None) -> List[Dict[str, str]]:
+        """Загружает страницу (условным запросом) и извлекает из нее вопросы"""
+        headers = self.http_cache.conditional_headers(url)
+        
+        if self._get_streaming_extractor() is not None:
+            return self._fetch_questions_streaming(url, timeout, category, headers)
+        
+        response = self.session.get(url, timeout=timeout, headers=headers)
+        
+        if response.status_code == 304:
+            questions = self._cached_questions(url, category)
+            if questions is not None:
+                return questions
+            # Тело пропало из кэша — запрашиваем страницу целиком
+            response = self.session.get(url, timeout=timeout)
+        
+        response.raise_for_status()
+        self.http_cache.store(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        
+        return self._parse_questions(response.content, category)
+    
+    async def _afetch_questions(self, url: str, timeout: float, category: str = None) -> List[Dict[str, str]]:
+        """Асинхронно загружает страницу (условным запросом) и извлекает из нее вопросы"""
+        headers = self.http_cache.conditional_headers(url)
+        
+        if self._get_streaming_extractor() is not None:
+            return await self._afetch_questions_streaming(url, timeout, category, headers)
+        
+        status, response_headers, content = await self.async_fetcher.fetch(url, timeout, headers)
+        
+        if status == 304:
+            questions = await self._in_executor(self._cached_questions, url, category)
+            if questions is not None:
+                return questions
+            status, response_headers, content = await self.async_fetcher.fetch(url, timeout)
+        
+        # Запись в дисковый кэш и разбор — одной задачей вне цикла событий
+        return await self._in_executor(self._store_and_parse, url, content, response_headers, category)
+    
+    def _fetch_questions_streaming(self, url: str, timeout: float, category: str, headers: Dict[str, str]) -> List[Dict[str, str]]:
+        """Потоковый вариант: разбор по мере загрузки, чтение обрывается на нужном числе вопросов"""
+        response = self.session.get(url, timeout=timeout, headers=headers, stream=True)
+        
+        try:
+            if response.status_code == 304:
+                questions = self._cached_questions(url, category)
+                if questions is not None:
+                    return questions
+                response.close()
+                response = self.session.get(url, timeout=timeout, stream=True)
+            
+            response.raise_for_status()
+            stream = self._open_stream(category, charset_from_content_type(response.headers.get('Content-Type')))
+            
+            for chunk in response.iter_content(chunk_size=config.PARSER_STREAM_CHUNK_SIZE):
+                if stream.feed(chunk):
+                    break
+            
+            return stream.close()
+        finally:
+            response.close()
+    
+    async def _afetch_questions_streaming(self, url: str, timeout: float, category: str, headers: Dict[str, str]) -> List[Dict[str, str]]:
+        """Асинхронный потоковый вариант загрузки и разбора"""
+        streams = []
+        
+        def open_consumer(encoding: Optional[str]):
+            stream = self._open_stream(category, encoding)
+            streams.append(stream)
+            # Разбор куска идет в потоке парсера, цикл событий тем временем обслуживает бота
+            return partial(self._in_executor, stream.feed)
+        
+        status = await self.async_fetcher.stream(url, timeout, open_consumer, headers)
+        
+        if status == 304:
+            questions = await self._in_executor(self._cached_questions, url, category)
+            if questions is not None:
+                return questions
+            await self.async_fetcher.stream(url, timeout, open_consumer)
+        
+        return await self._in_executor(streams[-1].close)
+    
+    def _store_and_parse(self, url: str, content: bytes, response_headers: Mapping[str, str], category: str = None) -> List[Dict[str, str]]:
+        """Сохраняет страницу в дисковый кэш и извлекает из нее вопросы"""
+        self.http_cache.store(url, content, response_headers.get('ETag'), response_headers.get('Last-Modified'))
+        return self._parse_questions(content, category)
+    
+    async def _in_executor(self, func, *args):
+        """Выполняет разбор страницы и работу с диском вне цикла событий, чтобы не задерживать обработчики бота"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='parser')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+    
+    def _open_stream(self, category: str = None, encoding: str = None):
+        """Создает потоковый разбор под общий экстрактор или категорию"""
+        extractor = self._get_streaming_extractor()
+        
+        if category:
+            matcher = self._get_category_matcher(category)
+            return extractor.open(None, lambda text: self._is_category_link(text, matcher), 10, encoding)
+        return extractor.open(self._is_question_text, self._is_question_link, config.PARSER_STREAM_TARGET, encoding)
+    
+    def _cached_questions(self, url: str, category: str = None) -> Optional[List[Dict[str, str]]]:
+        """Возвращает вопросы для неизменившейся страницы (ответ 304)
+        
+        Результат берется из ParseMemo по хэшу тела и отпечатку экстрактора;
+        тело читается с диска и разбирается, только если в памяти его нет.
+        """
+        digest = self.http_cache.digest(url)
+        if digest is None:
+            return None
+        
+        questions = self.parse_memo.get(self._memo_key(digest, category))
+        if questions is not None:
+            return questions
+        
+        content = self.http_cache.load(url)
+        if content is None:
+            return None
+        return self._parse_questions(content, category)
+    
+    def _parse_key(self, category: str = None) -> str:
+        """Ключ результата разбора: общий экстрактор или категория"""
+        return category.lower() if category else 'default'
+    
+    def _memo_key(self, digest: str, category: str = None) -> tuple:
+        """Ключ ParseMemo: хэш содержимого, категория и отпечаток экстрактора"""
+        return (digest, self._parse_key(category), self._extractor_fingerprint(category))
+    
+    async def _afetch_first_questions(self, category: str = None, deadline: float = None) -> Optional[List[Dict[str, str]]]:
+        """Запрашивает все URL параллельно и возвращает первый непустой результат
+        
+        Оставшиеся запросы отменяются, как только одна страница дала вопросы.
+        По истечении общего дедлайна возвращает None, чтобы сразу уйти в рофло.
+        """
+        deadline = config.PARSER_FANOUT_DEADLINE if deadline is None else deadline
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline
+        
+        tasks = [
+            asyncio.ensure_future(self._afetch_questions(url, timeout=15, category=category))
+            for url in self.urls
+        ]
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    break
+                
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                
+                # При одновременном завершении предпочитаем URL из начала списка
+                for task in tasks:
+                    if task in done and not task.cancelled() and task.exception() is None and task.result():
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        return None
+    
+    def _parse_questions(self, content: bytes, category: str = None) -> List[Dict[str, str]]:
+        """Разбирает HTML и извлекает вопросы (общие или по категории)
+        
+        Результат запоминается по хэшу содержимого, поэтому неизменившаяся
+        страница повторно не разбирается.
+        """
+        memo_key = self._memo_key(hashlib.sha1(content).hexdigest(), category)
+        questions = self.parse_memo.get(memo_key)
+        if questions is not None:
+            return questions
+        
+        questions = self._extract_with_lxml(content, category)
+        
+        if questions is None:
+            # Запасной путь: BeautifulSoup
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            if category:
+                questions = self._extract_questions_by_category(soup, category)
+            else:
+                questions = self._extract_questions(soup)
+        
+        self.parse_memo.put(memo_key, questions)
+        return questions
+    
+    def _extract_with_lxml(self, content: bytes, category: str = None) -> Optional[List[Dict[str, str]]]:
+        """Быстрый путь на lxml; None означает, что нужен запасной BeautifulSoup"""
+        extractor = self._get_lxml_extractor()
+        if extractor is None:
+            return None
+        
+        try:
+            root = extractor.parse(content)
+            
+            if category:
+                matcher = self._get_category_matcher(category)
+                return extractor.extract_links(root, lambda text: self._is_category_link(text, matcher))
+            return extractor.extract_questions(root, self._is_question_text, self._is_question_link)
+            
+        except Exception as e:
+            print(f"⚠️ lxml не справился со страницей, используем BeautifulSoup: {e}")
+            return None
+    
+    def _get_lxml_extractor(self) -> Optional[LxmlExtractor]:
+        """Возвращает lxml-экстрактор, перекомпилируя его при смене селекторов"""
+        if config.PARSER_ENGINE != 'lxml':
+            return None
+        
+        selectors = tuple(self.selectors)
+        if self._lxml_selectors != selectors:
+            self._lxml_selectors = selectors
+            try:
+                self._lxml_extractor = LxmlExtractor(selectors)
+            except ValueError as e:
+                print(f"⚠️ Селекторы не поддерживаются lxml-экстрактором: {e}")
+                self._lxml_extractor = None
+        
+        return self._lxml_extractor
+    
+    def _get_streaming_extractor(self) -> Optional[StreamingExtractor]:
+        """Возвращает потоковый экстрактор, если потоковый режим включен"""
+        if not config.PARSER_STREAMING:
+            return None
+        
+        selectors = tuple(self.selectors)
+        if self._streaming_selectors != selectors:
+            self._streaming_selectors = selectors
+            try:
+                self._streaming_extractor = StreamingExtractor(selectors)
+            except ValueError as e:
+                # Без потокового экстрактора страница просто загружается целиком
+                print(f"⚠️ Селекторы не поддерживаются потоковым экстрактором: {e}")
+                self._streaming_extractor = None
+        
+        return self._streaming_extractor
+    
+    def _extractor_fingerprint(self, category: str = None) -> tuple:
+        """Отпечаток настроек экстрактора: при их смене старые записи кэша не используются"""
+        if category:
+            return (config.PARSER_ENGINE, tuple(self.game_categories.get(category.lower(), [])))
+        return (config.PARSER_ENGINE, tuple(self.selectors), tuple(self.question_words), tuple(self.link_question_words))
+    
+    def set_selectors(self, selectors: List[str]):
+        """Заменяет список селекторов и сбрасывает кэш результатов разбора"""
+        self.selectors = list(selectors)
+        self.parse_memo.invalidate()
+    
+    def _make_real_question(self, question: Dict[str, str]) -> Dict[str, str]:
+        """Оформляет реальный вопрос с Answer Mail.ru"""
+        return {
+            'text': question['text'],
+            'source': 'Answer Mail.ru',
+            'type': 'real'
+        }
+    
+    def _make_category_question(self, question: Dict[str, str], category: str) -> Dict[str, str]:
+        """Оформляет вопрос по игровой категории"""
+        return {
+            'text': question['text'],
+            'source': 'Answer Mail.ru',
+            'type': 'category',
+            'category': category
+        }
+    
     def _extract_questions(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """Извлекает вопросы из HTML с расширенными селекторами"""
         questions = []
         
-        # Расширенный список селекторов для поиска вопросов
-        selectors = [
-            '.question__text',
-            '.question-title',
-            '.question',
-            'h2 a',
-            '.qa-item__title',
-            '.question-item__title',
-            '.question-item__text',
-            '.qa-question__title',
-            '.qa-question__text',
-            'h3 a',
-            'h4 a',
-            '.title a',
-            '.text a',
-            'a[href*="question"]',
-            'a[href*="answer"]'
-        ]
-        
-        for selector in selectors:
+        for selector in self.selectors:
             try:
                 elements = soup.select(selector)
                 if elements:
                     print(f"🔍 Найден селектор: {selector} ({len(elements)} элементов)")
                     for element in elements[:15]:  # Берем больше элементов
                         text = element.get_text(strip=True)
-                        if text and len(text) > 15 and len(text) < 200:  # Фильтруем по длине
-                            # Проверяем, что это похоже на вопрос
-                            if any(word in text.lower() for word in ['как', 'что', 'где', 'когда', 'почему', 'зачем', 'можно ли', 'стоит ли']):
-                                questions.append({
-                                    'text': text,
-                                    'source': 'Answer Mail.ru'
-                                })
+                        if self._is_question_text(text):
+                            questions.append({
+                                'text': text,
+                                'source': 'Answer Mail.ru'
+                            })
                     if questions:
                         break
             except Exception as e:
@@ -276,22 +646,20 @@ class QuestionParser:
     def _extract_questions_by_category(self, soup: BeautifulSoup, category: str) -> List[Dict[str, str]]:
         """Извлекает вопросы по конкретной категории"""
         questions = []
-        keywords = self.game_categories.get(category.lower(), [])
+        matcher = self._get_category_matcher(category)
         
         # Ищем все ссылки с текстом
         links = soup.find_all('a', href=True)
         
         for link in links:
             text = link.get_text(strip=True)
-            if text and len(text) > 20 and len(text) < 150:
-                # Проверяем, что текст содержит ключевые слова категории
-                if any(keyword in text.lower() for keyword in keywords):
-                    questions.append({
-                        'text': text,
-                        'source': 'Answer Mail.ru'
-                    })
-                    if len(questions) >= 10:
-                        break
+            if self._is_category_link(text, matcher):
+                questions.append({
+                    'text': text,
+                    'source': 'Answer Mail.ru'
+                })
+                if len(questions) >= 10:
+                    break
         
         return questions
     
@@ -304,32 +672,66 @@ class QuestionParser:
         
         for link in links:
             text = link.get_text(strip=True)
-            if text and len(text) > 20 and len(text) < 150:
-                # Проверяем, что это похоже на вопрос
-                if any(word in text.lower() for word in ['как', 'что', 'где', 'когда', 'почему', 'зачем', 'можно ли', 'стоит ли', 'помогите', 'подскажите']):
-                    questions.append({
-                        'text': text,
-                        'source': 'Answer Mail.ru'
-                    })
-                    if len(questions) >= 10:
-                        break
+            if self._is_question_link(text):
+                questions.append({
+                    'text': text,
+                    'source': 'Answer Mail.ru'
+                })
+                if len(questions) >= 10:
+                    break
         
         return questions
     
+    def _is_question_text(self, text: str) -> bool:
+        """Фильтр для элементов, найденных по селекторам"""
+        if text and len(text) > 15 and len(text) < 200:  # Фильтруем по длине
+            # Проверяем, что это похоже на вопрос
+            return self._question_matcher.matches(text)
+        return False
+    
+    def _is_question_link(self, text: str) -> bool:
+        """Фильтр для текстов ссылок, если селекторы не сработали"""
+        if text and len(text) > 20 and len(text) < 150:
+            return self._link_question_matcher.matches(text)
+        return False
+    
+    def _is_category_link(self, text: str, matcher: KeywordMatcher) -> bool:
+        """Фильтр для текстов ссылок по ключевым словам категории"""
+        if text and len(text) > 20 and len(text) < 150:
+            # Проверяем, что текст содержит ключевые слова категории
+            return matcher.matches(text)
+        return False
+    
+    def _get_category_matcher(self, category: str) -> KeywordMatcher:
+        """Возвращает фильтр категории, перекомпилируя его при смене ключевых слов"""
+        key = category.lower()
+        keywords = tuple(self.game_categories.get(key, []))
+        matcher = self._category_matchers.get(key)
+        
+        if matcher is None or matcher.words != keywords:
+            matcher = KeywordMatcher(keywords)
+            self._category_matchers[key] = matcher
+        
+        return matcher
+    
     def get_questions_by_category(self, category: str = "popular") -> List[Dict[str, str]]:
         """Получает вопросы по категории"""
         try:
             url = f"{config.ANSWER_MAIL_RU_URL}/{category}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return self._extract_questions(soup)
+            return self._fetch_questions(url, timeout=15)
             
         except Exception as e:
             print(f"❌ Ошибка при получении вопросов по категории: {e}")
             return []
     
     def close(self):
-        """Закрывает сессию"""
+        """Закрывает сессию и поток разбора"""
         self.session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def aclose(self):
+        """Закрывает синхронную и асинхронную сессии"""
+        self.close()
+        await self.async_fetcher.close()
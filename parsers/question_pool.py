@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import config
+
+logger = logging.getLogger(__name__)
+
+class QuestionPool:
+    """Пул заранее загруженных вопросов с фоновым обновлением по TTL"""
+    
+    def __init__(self, parser, size: int = None, refresh_interval: float = None, low_watermark: int = None):
+        """Инициализация пула (фоновая задача запускается через start)"""
+        self.parser = parser
+        self.size = size or config.QUESTION_POOL_SIZE
+        self.refresh_interval = refresh_interval or config.QUESTION_POOL_REFRESH_INTERVAL
+        self.low_watermark = config.QUESTION_POOL_LOW_WATERMARK if low_watermark is None else low_watermark
+        
+        # Очередь (время загрузки, вопрос); порядок уже перемешан при пополнении
+        self._questions: Deque[Tuple[float, Dict[str, str]]] = deque()
+        self._refill_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._questions)
+    
+    def get(self) -> Dict[str, str]:
+        """Выдает вопрос из пула за O(1), никогда не обращаясь к сети"""
+        now = time.monotonic()
+        question = None
+        
+        while self._questions:
+            fetched_at, candidate = self._questions.popleft()
+            # Устаревшие вопросы просто выбрасываем
+            if now - fetched_at <= self.refresh_interval:
+                question = dict(candidate)
+                break
+        
+        if len(self._questions) <= self.low_watermark:
+            self._refill_event.set()
+        
+        # Пока пул пуст, отдаем рофло-вопрос
+        return question or self.parser.get_roflo_question()
+    
+    def start(self):
+        """Запускает фоновую задачу наполнения пула"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Останавливает фоновую задачу"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def refill(self):
+        """Загружает свежие вопросы и пересобирает пул"""
+        fetched = await self.parser.afetch_real_questions()
+        now = time.monotonic()
+        
+        if not fetched:
+            return
+        
+        random.shuffle(fetched)
+        entries = deque((now, question) for question in fetched[:self.size])
+        seen = {question['text'] for _, question in entries}
+        
+        # Досыпаем невыданные и еще не устаревшие вопросы
+        for fetched_at, question in self._questions:
+            if len(entries) >= self.size:
+                break
+            if question['text'] not in seen and now - fetched_at <= self.refresh_interval:
+                entries.append((fetched_at, question))
+                seen.add(question['text'])
+        
+        self._questions = entries
+        self.last_refresh = now
+        logger.info(f"Пул вопросов обновлен: {len(entries)} вопросов")
+    
+    async def _run(self):
+        """Цикл пополнения: по TTL или при опускании ниже нижней границы"""
+        while True:
+            try:
+                await self.refill()
+            except Exception as e:
+                logger.warning(f"Ошибка при пополнении пула вопросов: {e}")
+            
+            # Не долбим сайт, даже если страницы дают мало вопросов
+            await asyncio.sleep(config.DELAY_BETWEEN_REQUESTS)
+            self._refill_event.clear()
+            
+            try:
+                await asyncio.wait_for(self._refill_event.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,185 @@
+from lxml import etree
+from typing import Callable, Dict, List, Optional, Sequence
+from parsers.lxml_extractor import LINK_LIMIT, SELECTOR_LIMIT, css_to_xpath_step, selector_key
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Кодировка из заголовка Content-Type, только если она указана явно"""
+    for param in (content_type or '').split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            return value.strip('"\' ')
+    return None
+
+class StreamingExtractor:
+    """Потоковое извлечение вопросов: HTML разбирается по мере поступления кусков"""
+    
+    def __init__(self, selectors: Sequence[str]):
+        """Компилирует проверку элемента по каждому селектору"""
+        self.selectors = tuple(selectors)
+        # XPath дорог, поэтому сначала сверяются тег и класс последнего шага селектора:
+        # (тег или None, класс или None, проверка)
+        self._selector_checks = []
+        for selector in self.selectors:
+            tag, classes = selector_key(selector)
+            check = etree.XPath('self::' + css_to_xpath_step(selector))
+            self._selector_checks.append((tag, classes[0] if classes else None, check))
+        # Как get_text в BeautifulSoup: содержимое script и style в текст не входит
+        self._texts = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+    
+    def matches(self, element, wanted: Sequence[bool]) -> List[int]:
+        """Номера селекторов из wanted, под которые подходит элемент"""
+        tag = element.tag
+        classes = None
+        result = []
+        for index, (key_tag, key_class, check) in enumerate(self._selector_checks):
+            if not wanted[index]:
+                continue
+            if key_tag is not None:
+                if key_tag != tag:
+                    continue
+            elif key_class is not None:
+                if classes is None:
+                    classes = (element.get('class') or '').split()
+                if key_class not in classes:
+                    continue
+            if check(element):
+                result.append(index)
+        return result
+    
+    def text(self, element) -> str:
+        """Аналог BeautifulSoup get_text(strip=True)"""
+        return ''.join(text.strip() for text in self._texts(element))
+    
+    def open(self, is_question: Optional[Callable[[str], bool]], is_link_question: Callable[[str], bool],
+             target: int, encoding: str = None) -> 'ExtractionStream':
+        """Начинает разбор нового ответа
+        
+        is_question проверяет элементы, совпавшие с селекторами (None — только ссылки),
+        is_link_question проверяет тексты ссылок.
+        """
+        return ExtractionStream(self, is_question, is_link_question, target, encoding)
+
+class ExtractionStream:
+    """Состояние потокового разбора одного ответа
+    
+    Результат совпадает с первыми target вопросами полного разбора
+    (LxmlExtractor.extract_questions): вопросы первого по приоритету селектора,
+    давшего их среди своих первых SELECTOR_LIMIT элементов, а если таких нет —
+    вопросы из ссылок. Чтение обрывается, как только этот результат уже не
+    может измениться от оставшейся части страницы.
+    """
+    
+    def __init__(self, extractor: StreamingExtractor, is_question, is_link_question, target: int, encoding: str = None):
+        self._extractor = extractor
+        self._is_question = is_question
+        self._is_link_question = is_link_question
+        self._target = target
+        # Без кодировки из Content-Type libxml2 определяет ее сам (BOM, <meta charset>)
+        self._parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        self._pending = b''
+        # Селектор -> его первые SELECTOR_LIMIT элементов в порядке документа (по открытию тега)
+        self._candidates: List[list] = [[] for _ in extractor.selectors] if is_question is not None else []
+        # Селекторы, которым еще нужны элементы (None — только ссылки)
+        self._wanted = [True] * len(extractor.selectors) if is_question is not None else None
+        self._open = set()
+        # Закрытый элемент-кандидат -> текст, если это вопрос, иначе None
+        self._closed: Dict = {}
+        self._links: List[str] = []
+        self.questions: List[Dict[str, str]] = []
+        self.done = False
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Разбирает очередной кусок; True — вопросов достаточно, читать дальше не нужно"""
+        # Пуш-парсер libxml2 может навсегда застрять, если кусок обрывается
+        # посреди разметки, поэтому отдаем ему данные только до конца тега
+        data = self._pending + chunk
+        end = data.rfind(b'>') + 1
+        self._pending = data[end:]
+        
+        if end:
+            self._parser.feed(data[:end])
+            self._drain()
+        return self.done
+    
+    def close(self) -> List[Dict[str, str]]:
+        """Завершает разбор и возвращает найденные вопросы"""
+        if not self.done:
+            try:
+                if self._pending:
+                    self._parser.feed(self._pending)
+                    self._pending = b''
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            self._drain()
+            self._decide(final=True)
+        return self.questions
+    
+    def _drain(self):
+        """Разбирает события открытия и закрытия элементов из последнего куска"""
+        extractor = self._extractor
+        changed = False
+        
+        for event, element in self._parser.read_events():
+            if self.done:
+                continue
+            
+            if event == 'start':
+                if self._wanted is not None:
+                    for index in extractor.matches(element, self._wanted):
+                        candidates = self._candidates[index]
+                        candidates.append(element)
+                        self._open.add(element)
+                        if len(candidates) == SELECTOR_LIMIT:
+                            self._wanted[index] = False
+                continue
+            
+            if element in self._open:
+                self._open.discard(element)
+                text = extractor.text(element)
+                self._closed[element] = text if self._is_question(text) else None
+                changed = True
+            
+            if len(self._links) < LINK_LIMIT and element.tag == 'a' and element.get('href') is not None:
+                text = extractor.text(element)
+                if self._is_link_question(text):
+                    self._links.append(text)
+                    changed = True
+            
+            # Содержимое скриптов и стилей вопросов не содержит — не держим его в памяти
+            if element.tag in ('script', 'style'):
+                element.clear(keep_tail=True)
+            
+            if changed:
+                changed = False
+                self._decide(final=False)
+    
+    def _decide(self, final: bool):
+        """Фиксирует результат, если остаток страницы его уже не изменит"""
+        result = None
+        
+        for candidates in self._candidates:
+            # Вопросы среди уже закрытых элементов, до первого еще открытого
+            questions = []
+            complete = final or len(candidates) == SELECTOR_LIMIT
+            for element in candidates:
+                if element not in self._closed:
+                    complete = False
+                    break
+                if self._closed[element] is not None:
+                    questions.append(self._closed[element])
+            
+            if len(questions) >= self._target or (complete and questions):
+                result = questions
+                break
+            if not complete:
+                # Этот селектор еще может дать вопросы раньше следующих
+                return
+        else:
+            # Ни один селектор вопросов не дал: вопросы из ссылок
+            if not final and len(self._links) < min(self._target, LINK_LIMIT):
+                return
+            result = self._links
+        
+        self.questions = [{'text': text, 'source': 'Answer Mail.ru'} for text in result[:self._target]]
+        self.done = True
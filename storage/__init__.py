@@ -0,0 +1 @@
+# Хранилища состояния ботов
@@ -0,0 +1,176 @@
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+class _ScoreNode:
+    """Узел декартова дерева: различный счет, число игроков с ним и в поддереве"""
+    
+    __slots__ = ('score', 'priority', 'count', 'total', 'left', 'right')
+    
+    def __init__(self, score: int, priority: float):
+        self.score = score
+        self.priority = priority
+        self.count = 0
+        self.total = 0
+        self.left: Optional['_ScoreNode'] = None
+        self.right: Optional['_ScoreNode'] = None
+
+def _total(node: Optional[_ScoreNode]) -> int:
+    return node.total if node is not None else 0
+
+def _split(node: Optional[_ScoreNode], score: int) -> Tuple[Optional[_ScoreNode], Optional[_ScoreNode]]:
+    """Делит дерево на счета меньше score и не меньше score"""
+    if node is None:
+        return None, None
+    if node.score < score:
+        node.right, right = _split(node.right, score)
+        node.total = node.count + _total(node.left) + _total(node.right)
+        return node, right
+    left, node.left = _split(node.left, score)
+    node.total = node.count + _total(node.left) + _total(node.right)
+    return left, node
+
+def _merge(left: Optional[_ScoreNode], right: Optional[_ScoreNode]) -> Optional[_ScoreNode]:
+    """Склеивает деревья, где все счета left меньше счетов right"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.total = left.count + _total(left.left) + _total(left.right)
+        return left
+    right.left = _merge(left, right.left)
+    right.total = right.count + _total(right.left) + _total(right.right)
+    return right
+
+class Leaderboard:
+    """Индекс рейтинга игроков: обновление и место за O(log n), топ-K за O(log n + K)
+    
+    Счета — неотрицательные целые очки без верхней границы. Декартово дерево
+    (treap) по различным счетам хранит, сколько игроков набрали каждый счет и
+    сколько их в поддереве, поэтому место игрока — это число игроков со счетом
+    выше, а топ — обход дерева от наибольшего счета. Память — O(n) по числу
+    игроков, а не по величине счета. Игроки с равным счетом упорядочены по
+    времени, когда они его набрали.
+    """
+    
+    def __init__(self, scores: Iterable[Tuple[Hashable, int]] = ()):
+        """Инициализация (scores — пары игрок, счет)"""
+        self._scores: Dict[Hashable, int] = {}
+        # Счет -> игроки в порядке достижения (dict как упорядоченное множество)
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._root: Optional[_ScoreNode] = None
+        self._rng = random.Random()
+        
+        for player, score in scores:
+            self.update(player, score)
+    
+    def __len__(self) -> int:
+        return len(self._scores)
+    
+    def __contains__(self, player: Hashable) -> bool:
+        return player in self._scores
+    
+    def score(self, player: Hashable) -> Optional[int]:
+        """Счет игрока или None"""
+        return self._scores.get(player)
+    
+    def update(self, player: Hashable, score: int):
+        """Ставит игроку новый счет"""
+        if not isinstance(score, int) or score < 0:
+            raise ValueError(f"Счет должен быть неотрицательным целым: {score!r}")
+        
+        old_score = self._scores.get(player)
+        if old_score == score:
+            return
+        if old_score is not None:
+            self._discard(player, old_score)
+        
+        self._scores[player] = score
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = {}
+            self._insert_score(score)
+        bucket[player] = None
+        self._add(score, 1)
+    
+    def remove(self, player: Hashable):
+        """Убирает игрока из рейтинга"""
+        score = self._scores.get(player)
+        if score is not None:
+            self._discard(player, score)
+    
+    def rank(self, player: Hashable) -> Optional[int]:
+        """Место игрока (1 — лучший, равные счета делят место) или None"""
+        score = self._scores.get(player)
+        if score is None:
+            return None
+        # Выше стоят все, у кого счет больше
+        return self._count_above(score) + 1
+    
+    def top(self, k: int = 10) -> List[Tuple[Hashable, int]]:
+        """Лучшие k игроков (игрок, счет), от лучшего"""
+        result = []
+        stack = []
+        node = self._root
+        
+        # Обход дерева от наибольшего счета к меньшим
+        while len(result) < k and (stack or node is not None):
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            for player in self._buckets[node.score]:
+                if len(result) == k:
+                    break
+                result.append((player, node.score))
+            node = node.left
+        
+        return result
+    
+    def _discard(self, player: Hashable, score: int):
+        del self._scores[player]
+        bucket = self._buckets[score]
+        del bucket[player]
+        self._add(score, -1)
+        if not bucket:
+            del self._buckets[score]
+            self._remove_score(score)
+    
+    def _insert_score(self, score: int):
+        """Добавляет в дерево узел нового счета (пока без игроков)"""
+        left, right = _split(self._root, score)
+        self._root = _merge(_merge(left, _ScoreNode(score, self._rng.random())), right)
+    
+    def _remove_score(self, score: int):
+        """Убирает из дерева узел счета, у которого не осталось игроков"""
+        left, right = _split(self._root, score)
+        _, right = _split(right, score + 1)
+        self._root = _merge(left, right)
+    
+    def _add(self, score: int, delta: int):
+        """Меняет число игроков со счетом score (узел уже есть в дереве)"""
+        node = self._root
+        while node is not None:
+            node.total += delta
+            if score < node.score:
+                node = node.left
+            elif score > node.score:
+                node = node.right
+            else:
+                node.count += delta
+                return
+    
+    def _count_above(self, score: int) -> int:
+        """Сколько игроков со счетом больше score"""
+        node = self._root
+        total = 0
+        while node is not None:
+            if score < node.score:
+                total += node.count + _total(node.right)
+                node = node.left
+            elif score > node.score:
+                node = node.right
+            else:
+                return total + _total(node.right)
+        return total
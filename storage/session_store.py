@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+import config
+
+logger = logging.getLogger(__name__)
+
+class SessionStore(MutableMapping):
+    """Хранилище сессий: LRU в памяти с вытеснением по простою
+    
+    В памяти не больше max_size записей; запись, к которой не обращались дольше
+    idle_ttl секунд, вытесняется. Словарь сессии меняют на месте
+    (store[user_id]['score'] += 1), поэтому каждое чтение помечает запись
+    измененной. Базовый класс ничего не сохраняет: вытесненная сессия теряется,
+    и пользователь начинает заново с /start. Подклассы добавляют долговременный
+    слой через _has, _load, _on_evict и _on_delete.
+    """
+    
+    def __init__(self, max_size: int = None, idle_ttl: float = None):
+        """Инициализация"""
+        self.max_size = max_size or config.SESSION_CACHE_SIZE
+        self.idle_ttl = config.SESSION_IDLE_TTL if idle_ttl is None else idle_ttl
+        # Ключ -> [значение, время последнего обращения]; порядок — от давно не использованных
+        self._entries: OrderedDict = OrderedDict()
+        self._dirty = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        self._expire(now)
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            value = self._load(key)
+            self._remember(key, value, now)
+        else:
+            self.hits += 1
+            entry[1] = now
+            self._entries.move_to_end(key)
+            value = entry[0]
+        
+        self._dirty.add(key)
+        return value
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        self._expire(now)
+        self._remember(key, value, now)
+        self._dirty.add(key)
+    
+    def __delitem__(self, key: Hashable):
+        if key not in self:
+            raise KeyError(key)
+        self._entries.pop(key, None)
+        self._dirty.discard(key)
+        self._on_delete(key)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        # Простоявшие записи сначала уходят в долговременный слой
+        self._expire(time.monotonic())
+        return key in self._entries or self._has(key)
+    
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._entries))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика памяти: размер, попадания, промахи и вытеснения"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+    
+    def scan(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Все пары (ключ, значение) без загрузки в память и без отметки об изменении"""
+        return iter([(key, entry[0]) for key, entry in self._entries.items()])
+    
+    def start(self):
+        """Запускает фоновые задачи (у хранилища в памяти их нет)"""
+    
+    async def stop(self):
+        """Останавливает фоновые задачи"""
+    
+    def _remember(self, key: Hashable, value: Any, now: float):
+        self._entries[key] = [value, now]
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._evict(*self._entries.popitem(last=False))
+    
+    def _expire(self, now: float):
+        """Вытесняет записи, простаивающие дольше idle_ttl (они в начале очереди)"""
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if now - entry[1] <= self.idle_ttl:
+                break
+            del entries[key]
+            self._evict(key, entry)
+    
+    def _evict(self, key: Hashable, entry: list):
+        self.evictions += 1
+        dirty = key in self._dirty
+        self._dirty.discard(key)
+        self._on_evict(key, entry[0], dirty)
+    
+    def _has(self, key: Hashable) -> bool:
+        """Есть ли сессия в долговременном слое"""
+        return False
+    
+    def _load(self, key: Hashable) -> Any:
+        """Загружает сессию из долговременного слоя (KeyError, если ее нет)"""
+        raise KeyError(key)
+    
+    def _on_evict(self, key: Hashable, value: Any, dirty: bool):
+        """Вызывается при вытеснении записи из памяти"""
+    
+    def _on_delete(self, key: Hashable):
+        """Вызывается при удалении записи"""
+
+class SqliteSessionStore(SessionStore):
+    """Сессии в памяти с отложенной записью в локальную SQLite
+    
+    Измененные записи не пишутся из обработчиков: раз в flush_interval секунд
+    (и когда вытесненных набирается flush_batch) они уходят в базу одной
+    транзакцией. Вытесненная из памяти сессия дочитывается из базы при следующем
+    обращении, поэтому сессии переживают перезапуск. Значения сериализуются pickle
+    в момент записи: до нее измененная вытесненная сессия хранится живым объектом,
+    и обработчик, державший ее через await, меняет тот же словарь, который
+    вернется при следующем обращении и уйдет в базу.
+    """
+    
+    def __init__(self, namespace: str, db_path: str = None, max_size: int = None, idle_ttl: float = None,
+                 flush_interval: float = None, flush_batch: int = None):
+        """Инициализация (namespace разделяет хранилища в одном файле)"""
+        super().__init__(max_size, idle_ttl)
+        self.namespace = namespace
+        self.db_path = db_path or config.SESSION_DB_PATH
+        self.flush_interval = flush_interval or config.SESSION_FLUSH_INTERVAL
+        self.flush_batch = flush_batch or config.SESSION_FLUSH_BATCH
+        # Вытесненные, но еще не записанные: ключ -> живое значение (None — удалить)
+        self._pending: Dict[Hashable, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        
+        self._db = sqlite3.connect(self.db_path)
+        # WAL и synchronous=NORMAL: фиксация пачки не ждет fsync на каждую транзакцию
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "namespace TEXT NOT NULL, key NOT NULL, value BLOB NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._db.commit()
+    
+    def __iter__(self) -> Iterator[Hashable]:
+        self.flush()
+        rows = self._db.execute("SELECT key FROM sessions WHERE namespace = ?", (self.namespace,))
+        return iter([key for key, in rows])
+    
+    def __len__(self) -> int:
+        self.flush()
+        return self._db.execute("SELECT COUNT(*) FROM sessions WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+    
+    def scan(self) -> Iterator[Tuple[Hashable, Any]]:
+        self.flush()
+        rows = self._db.execute("SELECT key, value FROM sessions WHERE namespace = ?", (self.namespace,))
+        return ((key, pickle.loads(value)) for key, value in rows)
+    
+    def start(self):
+        """Запускает фоновую запись измененных сессий"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Останавливает фоновую запись, сбрасывает все изменения и закрывает базу"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+        self._db.close()
+    
+    def flush(self) -> int:
+        """Записывает измененные и вытесненные сессии одной транзакцией"""
+        rows = {
+            key: None if value is None else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            for key, value in self._pending.items()
+        }
+        for key in self._dirty:
+            rows[key] = pickle.dumps(self._entries[key][0], pickle.HIGHEST_PROTOCOL)
+        
+        if not rows:
+            return 0
+        
+        now = time.time()
+        upserts = [(self.namespace, key, value, now) for key, value in rows.items() if value is not None]
+        deletes = [(self.namespace, key) for key, value in rows.items() if value is None]
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)", upserts)
+            self._db.executemany("DELETE FROM sessions WHERE namespace = ? AND key = ?", deletes)
+        
+        self._pending.clear()
+        self._dirty.clear()
+        return len(rows)
+    
+    async def _run(self):
+        """Цикл отложенной записи"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self._expire(time.monotonic())
+                self.flush()
+            except (sqlite3.Error, pickle.PicklingError) as e:
+                logger.error(f"Ошибка записи сессий {self.namespace}: {e}")
+    
+    def _has(self, key: Hashable) -> bool:
+        if key in self._pending:
+            return self._pending[key] is not None
+        return self._db.execute(
+            "SELECT 1 FROM sessions WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone() is not None
+    
+    def _load(self, key: Hashable) -> Any:
+        if key in self._pending:
+            # Тот же объект, что остался у обработчиков: их изменения не теряются
+            if self._pending[key] is None:
+                raise KeyError(key)
+            return self._pending.pop(key)
+        
+        row = self._db.execute(
+            "SELECT value FROM sessions WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+    
+    def _on_evict(self, key: Hashable, value: Any, dirty: bool):
+        if not dirty:
+            return
+        self._pending[key] = value
+        if len(self._pending) >= self.flush_batch:
+            self.flush()
+    
+    def _on_delete(self, key: Hashable):
+        self._pending[key] = None
+
+def create_session_store(namespace: str, backend: str = None) -> SessionStore:
+    """Создает хранилище сессий выбранного типа (config.SESSION_BACKEND)"""
+    backend = backend or config.SESSION_BACKEND
+    
+    if backend == 'memory':
+        return SessionStore()
+    if backend == 'sqlite':
+        return SqliteSessionStore(namespace)
+    raise ValueError(f"Неизвестное хранилище сессий: {backend} (ожидается memory или sqlite)")
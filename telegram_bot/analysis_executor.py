@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+from analyzers.pain_analyzer import PainAnalyzer
+from analyzers.pain_analysis import PainAnalysis
+from generators.solution_generator import SolutionGenerator
+import config
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ('thread', 'process')
+
+# Анализатор и генератор процесса-воркера (режим process)
+_pain_analyzer: Optional[PainAnalyzer] = None
+_solution_generator: Optional[SolutionGenerator] = None
+
+def _init_worker(precomputed: Sequence[str]):
+    """Инициализация процесса-воркера: свои анализатор и генератор с тем же закрепленным корпусом"""
+    global _pain_analyzer, _solution_generator
+    _pain_analyzer = PainAnalyzer()
+    _pain_analyzer.precompute(precomputed)
+    _solution_generator = SolutionGenerator()
+
+def _run_in_worker(job, *args):
+    """Выполняет задачу на анализаторе и генераторе процесса-воркера"""
+    return job(_pain_analyzer, _solution_generator, *args)
+
+def _analyze(pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator, question: str) -> PainAnalysis:
+    return pain_analyzer.analyze_pain(question)
+
+def _generate(pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator,
+              pain_analysis: PainAnalysis, question: Optional[str]) -> Dict:
+    return solution_generator.generate_solution(pain_analysis, question)
+
+def _analyze_many(pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator,
+                  questions: List[str]) -> List[PainAnalysis]:
+    return pain_analyzer.analyze_many(questions)
+
+def _generate_many(pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator,
+                   pain_analyses: List[PainAnalysis], questions: List[str]) -> List[Dict]:
+    return list(solution_generator.generate_many(pain_analyses, questions))
+
+def _analyze_and_generate_many(pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator,
+                               questions: List[str]) -> List[Tuple[PainAnalysis, Dict]]:
+    pain_analyses = pain_analyzer.analyze_many(questions)
+    return list(zip(pain_analyses, solution_generator.generate_many(pain_analyses, questions)))
+
+class AnalysisExecutor:
+    """Выполняет анализ боли и генерацию решений вне цикла событий бота
+    
+    Задачи уходят в пул потоков или процессов через run_in_executor. В работе
+    одновременно не больше queue_size задач: остальные обработчики ждут свободного
+    места (обратное давление), поэтому тяжелая команда одного чата не копит
+    очередь и не задерживает ответы остальным.
+    """
+    
+    def __init__(self, pain_analyzer: PainAnalyzer, solution_generator: SolutionGenerator,
+                 mode: str = None, workers: int = None, queue_size: int = None):
+        """Инициализация (пул создается в start)"""
+        self.pain_analyzer = pain_analyzer
+        self.solution_generator = solution_generator
+        self.mode = mode or config.BOT_EXECUTOR
+        if self.mode not in EXECUTOR_MODES:
+            raise ValueError(f"Неизвестный режим пула: {self.mode} (ожидается {' или '.join(EXECUTOR_MODES)})")
+        self.workers = workers or config.BOT_EXECUTOR_WORKERS
+        self.queue_size = queue_size or config.BOT_EXECUTOR_QUEUE_SIZE
+        
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+    
+    def start(self):
+        """Создает пул потоков или процессов"""
+        if self._executor is not None:
+            return
+        
+        if self.mode == 'process':
+            # Процессам нужен тот же закрепленный корпус, что и анализатору бота
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.pain_analyzer.precomputed_keys,)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analysis')
+        self._slots = asyncio.Semaphore(self.queue_size)
+        logger.info(f"Пул анализа запущен: {self.mode}, воркеров {self.workers}, очередь {self.queue_size}")
+    
+    async def stop(self):
+        """Останавливает пул, отменяя задачи, которые еще не начались"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def analyze(self, question: str) -> PainAnalysis:
+        """Анализ боли одного вопроса"""
+        return await self._submit(_analyze, question)
+    
+    async def generate(self, pain_analysis: PainAnalysis, question: str = None) -> Dict:
+        """Решение по готовому анализу"""
+        return await self._submit(_generate, pain_analysis, question)
+    
+    async def analyze_many(self, questions: List[str]) -> List[PainAnalysis]:
+        """Анализы пачки вопросов одной задачей"""
+        return await self._submit(_analyze_many, list(questions))
+    
+    async def generate_many(self, pain_analyses: List[PainAnalysis], questions: List[str]) -> List[Dict]:
+        """Решения пачки анализов одной задачей (зерно — по тексту вопроса)"""
+        return await self._submit(_generate_many, list(pain_analyses), list(questions))
+    
+    async def analyze_and_generate(self, question: str) -> Tuple[PainAnalysis, Dict]:
+        """Анализ и решение одного вопроса одной задачей"""
+        return (await self._submit(_analyze_and_generate_many, [question]))[0]
+    
+    async def analyze_and_generate_many(self, questions: List[str]) -> List[Tuple[PainAnalysis, Dict]]:
+        """Анализы и решения пачки вопросов одной задачей (пары в порядке входа)"""
+        return await self._submit(_analyze_and_generate_many, list(questions))
+    
+    def stats(self) -> Dict[str, object]:
+        """Состояние пула: задачи в работе и ожидающие места"""
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting
+        }
+    
+    async def _submit(self, job, *args):
+        """Ждет места в очереди и выполняет задачу в пуле"""
+        if self._executor is None:
+            self.start()
+        
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        
+        if self.mode == 'process':
+            call = partial(_run_in_worker, job, *args)
+        else:
+            call = partial(job, self.pain_analyzer, self.solution_generator, *args)
+        
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except BaseException:
+            self._release()
+            raise
+        
+        # Место освобождается, только когда задача действительно закончилась:
+        # отмена обработчика не отменяет уже запущенный расчет
+        future.add_done_callback(self._release)
+        return await asyncio.shield(future)
+    
+    def _release(self, future: asyncio.Future = None):
+        self.in_flight -= 1
+        self._slots.release()
@@ -9,8 +9,14 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from parsers.question_parser import QuestionParser
+from parsers.question_pool import QuestionPool
 from analyzers.pain_analyzer import PainAnalyzer
 from generators.solution_generator import SolutionGenerator
+from telegram_bot.analysis_executor import AnalysisExecutor
+from storage.session_store import create_session_store
+from telegram_bot.rate_limiter import OutboundRateLimiter
+from telegram_bot.update_processor import ChatOrderedUpdateProcessor
+from telegram_bot.webhook_server import run_webhook
 import config
 
 # Настройка логирования
@@ -23,9 +29,14 @@ logger = logging.getLogger(__name__)
 class PrometheusBot:
     def __init__(self):
         self.question_parser = QuestionParser()
+        self.question_pool = QuestionPool(self.question_parser)
         self.pain_analyzer = PainAnalyzer()
         self.solution_generator = SolutionGenerator()
-        self.current_data = {}  # Храним текущие данные для пользователя
+        # Анализ встроенного рофло-корпуса считается один раз при запуске
+        self.pain_analyzer.precompute(self.question_parser.roflo_questions)
+        # Анализ и генерация идут в пуле, а не в цикле событий
+        self.analysis_executor = AnalysisExecutor(self.pain_analyzer, self.solution_generator)
+        self.current_data = create_session_store('current_data')  # Храним текущие данные для пользователя
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обработчик команды /start"""
@@ -71,7 +82,7 @@ class PrometheusBot:
         await query.edit_message_text("🔍 Ищу случайный вопрос...")
         
         try:
-            question_data = self.question_parser.get_random_question()
+            question_data = self.question_pool.get()
             
             if question_data:
                 self.current_data[user_id] = {
@@ -114,7 +125,7 @@ class PrometheusBot:
         await query.edit_message_text("🧠 Анализирую скрытую боль...")
         
         try:
-            pain_analysis = self.pain_analyzer.analyze_pain(question)
+            pain_analysis = await self.analysis_executor.analyze(question)
             self.current_data[user_id]['pain_analysis'] = pain_analysis
             
             keyboard = [
@@ -157,7 +168,7 @@ class PrometheusBot:
         
         try:
             pain_analysis = self.current_data[user_id]['pain_analysis']
-            solution = self.solution_generator.generate_solution(pain_analysis)
+            solution = await self.analysis_executor.generate(pain_analysis, self.current_data[user_id]['question'])
             
             self.current_data[user_id]['solution'] = solution
             
@@ -235,18 +246,48 @@ class PrometheusBot:
         
         await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
     
-    def run(self):
-        """Запускает бота"""
-        if not config.TELEGRAM_TOKEN:
-            logger.error("TELEGRAM_TOKEN не установлен!")
-            return
-        
-        application = Application.builder().token(config.TELEGRAM_TOKEN).build()
+    async def startup(self, application: Application):
+        """Запускает фоновое наполнение пула вопросов и пул анализа"""
+        self.question_pool.start()
+        self.analysis_executor.start()
+        self.current_data.start()
+    
+    async def shutdown(self, application: Application):
+        """Останавливает пулы, сохраняет сессии и закрывает сетевые сессии парсера"""
+        await self.question_pool.stop()
+        await self.analysis_executor.stop()
+        await self.current_data.stop()
+        await self.question_parser.aclose()
+    
+    def build_application(self, base_url: str = None) -> Application:
+        """Создает приложение со всеми обработчиками (base_url — другой адрес Bot API)"""
+        builder = Application.builder().token(config.TELEGRAM_TOKEN).post_init(self.startup).post_shutdown(self.shutdown)
+        # Разные пользователи обрабатываются параллельно, обновления одного — по порядку
+        builder = builder.concurrent_updates(ChatOrderedUpdateProcessor())
+        # Исходящие сообщения ждут очереди в пределах лимитов Telegram
+        builder = builder.rate_limiter(OutboundRateLimiter())
+        if base_url:
+            builder = builder.base_url(base_url)
+        application = builder.build()
         
         # Добавляем обработчики
         application.add_handler(CommandHandler("start", self.start))
         application.add_handler(CallbackQueryHandler(self.button_handler))
         
+        return application
+    
+    def run(self, webhook: bool = False):
+        """Запускает бота (long polling или webhook-сервер)"""
+        if not config.TELEGRAM_TOKEN:
+            logger.error("TELEGRAM_TOKEN не установлен!")
+            return
+        
+        application = self.build_application()
+        
         # Запускаем бота
-        logger.info("Бот запущен!")
-        application.run_polling()
+        if webhook:
+            logger.info("Бот запущен в режиме webhook!")
+            asyncio.run(run_webhook(application))
+        else:
+            logger.info("Бот запущен!")
+            application.run_polling()
@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+from telegram_bot.analysis_executor import AnalysisExecutor
+import config
+
+class DemoStats:
+    """Бегущие агрегаты демонстрации: память не растет с числом вопросов"""
+    
+    def __init__(self, top_size: int = 5):
+        """Инициализация"""
+        self.top_size = top_size
+        self.total = 0
+        self.roflo_questions = 0
+        self.confidence_sum = 0.0
+        self.stars_sum = 0
+        self.ipo_ready = 0
+        # Min-куча (уровень рофла, -номер, результат): в вершине худший из лучших
+        self._top: List[Tuple[int, int, Dict]] = []
+    
+    @property
+    def real_questions(self) -> int:
+        return self.total - self.roflo_questions
+    
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.total if self.total else 0.0
+    
+    @property
+    def avg_stars(self) -> float:
+        return self.stars_sum / self.total if self.total else 0.0
+    
+    def add(self, result: Dict):
+        """Учитывает результат по одному вопросу"""
+        self.total += 1
+        if result['question']['type'] == 'roflo':
+            self.roflo_questions += 1
+        self.confidence_sum += result['pain_analysis']['confidence_score']
+        self.stars_sum += len(result['rofl_level']['stars'])
+        if 'IPO' in str(result['rofl_level']):
+            self.ipo_ready += 1
+        
+        # При равном уровне выше тот, кто раньше по номеру
+        entry = (result['solution'].get('roflo_level', 0), -result['number'], result)
+        if len(self._top) < self.top_size:
+            heapq.heappush(self._top, entry)
+        elif entry[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, entry)
+    
+    def top(self) -> List[Dict]:
+        """Лучшие результаты по уровню рофла, от лучшего"""
+        return [result for _, _, result in sorted(self._top, key=lambda entry: entry[:2], reverse=True)]
+
+class DemoPipeline:
+    """Конвейер демонстрации /demoN: загрузка, анализ и генерация идут параллельными стадиями
+    
+    Вопросы проходят кусками по chunk_size через ограниченные очереди, на стадиях
+    анализа и генерации одновременно работает не больше workers кусков. Готовые
+    результаты отдаются в on_result, прогресс — в on_progress не чаще progress_interval.
+    """
+    
+    def __init__(self, question_parser, analysis_executor: AnalysisExecutor, chunk_size: int = None,
+                 workers: int = None, progress_interval: float = None):
+        """Инициализация"""
+        self.question_parser = question_parser
+        self.analysis_executor = analysis_executor
+        # Кусок добивается уникальными рофло-вопросами, поэтому не больше их числа
+        self.chunk_size = min(chunk_size or config.DEMO_CHUNK_SIZE, len(question_parser.roflo_questions))
+        self.workers = workers or config.DEMO_WORKERS
+        self.progress_interval = config.DEMO_PROGRESS_INTERVAL if progress_interval is None else progress_interval
+    
+    async def run(self, count: int, on_result: Callable[[int, Dict, Dict, Dict], None],
+                  on_progress: Callable[[int], Awaitable[None]] = None) -> int:
+        """Прогоняет count вопросов и возвращает число обработанных"""
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+        analyzed: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+        state = {'done': 0, 'reported_at': time.monotonic()}
+        
+        async def fetch():
+            for start in range(0, count, self.chunk_size):
+                size = min(self.chunk_size, count - start)
+                questions = (await self.question_parser.aget_multiple_questions(size))[:size]
+                await fetched.put((start, questions))
+            for _ in range(self.workers):
+                await fetched.put(None)
+        
+        async def analyze():
+            while True:
+                item = await fetched.get()
+                if item is None:
+                    await analyzed.put(None)
+                    return
+                start, questions = item
+                pain_analyses = await self.analysis_executor.analyze_many([question['text'] for question in questions])
+                await analyzed.put((start, questions, pain_analyses))
+        
+        async def generate():
+            while True:
+                item = await analyzed.get()
+                if item is None:
+                    return
+                start, questions, pain_analyses = item
+                solutions = await self.analysis_executor.generate_many(pain_analyses, [question['text'] for question in questions])
+                
+                for number, (question, pain_analysis, solution) in enumerate(zip(questions, pain_analyses, solutions), start + 1):
+                    on_result(number, question, pain_analysis, solution)
+                state['done'] += len(questions)
+                
+                now = time.monotonic()
+                if on_progress and now - state['reported_at'] >= self.progress_interval:
+                    state['reported_at'] = now
+                    await on_progress(state['done'])
+        
+        tasks = [asyncio.create_task(fetch())]
+        tasks += [asyncio.create_task(analyze()) for _ in range(self.workers)]
+        tasks += [asyncio.create_task(generate()) for _ in range(self.workers)]
+        
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Упавшая стадия не должна оставлять остальные висеть на очередях
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        return state['done']
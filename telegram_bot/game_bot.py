@@ -1,7 +1,10 @@
 import asyncio
 import logging
 import random
+import re
+from typing import Dict, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
+from telegram.error import TelegramError
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, ContextTypes, filters
 import sys
 import os
@@ -10,8 +13,16 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from parsers.question_parser import QuestionParser
+from parsers.question_pool import QuestionPool
 from analyzers.pain_analyzer import PainAnalyzer
 from generators.solution_generator import SolutionGenerator
+from telegram_bot.analysis_executor import AnalysisExecutor
+from telegram_bot.demo_pipeline import DemoPipeline, DemoStats
+from storage.leaderboard import Leaderboard
+from storage.session_store import create_session_store
+from telegram_bot.rate_limiter import OutboundRateLimiter, UserRateLimiter
+from telegram_bot.update_processor import ChatOrderedUpdateProcessor
+from telegram_bot.webhook_server import run_webhook
 import config
 
 # Настройка логирования
@@ -21,13 +32,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Команда демонстрации с необязательным размером: /demo, /demo50, /demo500@bot
+DEMO_COMMAND_PATTERN = r'^/demo(\d*)(?:@\w+)?(?:\s|$)'
+
+# Классы стоимости для ограничения частоты (остальные команды и кнопки — light)
+COMMAND_COST_CLASSES = {
+    'play': 'medium', 'rofl': 'medium', 'bazar': 'medium', 'shiza': 'medium', 'vazshe': 'medium'
+}
+CALLBACK_COST_CLASSES = {
+    'start_game': 'medium', 'next_question': 'medium', 'analyze_pain': 'medium', 'generate_solution': 'medium',
+    'more_rofl': 'medium', 'more_bazar': 'medium', 'more_shiza': 'medium', 'more_vazshe': 'medium'
+}
+
 class GamePrometheusBot:
     def __init__(self):
         self.question_parser = QuestionParser()
+        self.question_pool = QuestionPool(self.question_parser)
         self.pain_analyzer = PainAnalyzer()
         self.solution_generator = SolutionGenerator()
-        self.user_sessions = {}  # Храним сессии пользователей
-        self.game_stats = {}      # Статистика игр
+        # Анализ встроенного рофло-корпуса считается один раз при запуске
+        self.pain_analyzer.precompute(self.question_parser.roflo_questions)
+        # Анализ и генерация идут в пуле, а не в цикле событий
+        self.analysis_executor = AnalysisExecutor(self.pain_analyzer, self.solution_generator)
+        # Частота команд: спам ждет своей очереди или сливается
+        self.rate_limiter = UserRateLimiter()
+        self.user_sessions = create_session_store('game_sessions')  # Храним сессии пользователей
+        self.game_stats = create_session_store('game_stats')        # Статистика игр
+        # Рейтинг по лучшему результату и имена игроков в нем собираются из сохраненной
+        # статистики один раз: показ рейтинга не читает статистику и не помечает ее к записи
+        self.leaderboard = Leaderboard()
+        self.leaderboard_names: Dict[int, str] = {}
+        for uid, stats in self.game_stats.scan():
+            if stats['best_score']:
+                self.leaderboard.update(uid, stats['best_score'])
+                self.leaderboard_names[uid] = stats.get('username', 'Игрок')
         
         # Игровые категории
         self.game_categories = [
@@ -58,6 +96,9 @@ class GamePrometheusBot:
                 'games_played': 0,
                 'best_score': 0
             }
+        self.game_stats[user_id]['username'] = username
+        if user_id in self.leaderboard:
+            self.leaderboard_names[user_id] = username
         
         welcome_text = f"""
 🎮 **Добро пожаловать в игру "Вопрос Магистру"!**
@@ -170,6 +211,7 @@ class GamePrometheusBot:
    Игр сыграно: {stats['games_played']}
    Общий счет: {stats['total_score']} очков
    Лучший результат: {stats['best_score']} очков
+   Место в рейтинге: {self.leaderboard.rank(user_id) or '—'} из {len(self.leaderboard)}
 
 🎯 **Достижения:**
    {'🥇 Мастер боли' if stats['best_score'] >= 100 else '🥈 Знаток' if stats['best_score'] >= 50 else '🥉 Новичок'}
@@ -211,7 +253,7 @@ class GamePrometheusBot:
    /bazar - 🗣️ Иу это базаришь да?
    /shiza - 🧘 Креативное шиза
    /vazshe - 🤔 Полный рофло-анализ
-   /demo50 - 🚀 Демо 50 рофло-вопросов
+   /demo50 - 🚀 Демо 50 рофло-вопросов (/demoN — любое число)
 
 🎭 **Цель:** Стань лучшим аналитиком боли и генератором SaaS-решений!
         """
@@ -227,17 +269,14 @@ class GamePrometheusBot:
             return
         
         # Получаем случайный рофло-вопрос
-        question_data = self.question_parser.get_random_question()
+        question_data = self.question_pool.get()
         
         if not question_data:
             await update.message.reply_text("❌ Не удалось получить рофло-вопрос. Попробуйте позже.")
             return
         
-        # Анализируем боль с рофло-стилем
-        pain_analysis = self.pain_analyzer.analyze_pain(question_data['text'])
-        
-        # Генерируем максимально рофло-решение
-        solution = self.solution_generator.generate_solution(pain_analysis)
+        # Анализируем боль с рофло-стилем и генерируем максимально рофло-решение
+        pain_analysis, solution = await self.analysis_executor.analyze_and_generate(question_data['text'])
         
         # Рофло-рейтинг
         rofl_level = self._calculate_rofl_level(pain_analysis, solution)
@@ -285,14 +324,14 @@ class GamePrometheusBot:
             return
         
         # Получаем случайный вопрос
-        question_data = self.question_parser.get_random_question()
+        question_data = self.question_pool.get()
         
         if not question_data:
             await update.message.reply_text("❌ Не удалось получить вопрос для базара.")
             return
         
         # Агрессивный анализ
-        pain_analysis = self.pain_analyzer.analyze_pain(question_data['text'])
+        pain_analysis = await self.analysis_executor.analyze(question_data['text'])
         
         bazar_text = f"""
 🗣️ **ИУ ЭТО БАЗАРИШЬ ДА?**
@@ -333,17 +372,14 @@ class GamePrometheusBot:
             return
         
         # Получаем случайный вопрос
-        question_data = self.question_parser.get_random_question()
+        question_data = self.question_pool.get()
         
         if not question_data:
             await update.message.reply_text("❌ Не удалось получить вопрос для шизы.")
             return
         
-        # Креативный анализ
-        pain_analysis = self.pain_analyzer.analyze_pain(question_data['text'])
-        
-        # Генерируем максимально креативное решение
-        solution = self.solution_generator.generate_solution(pain_analysis)
+        # Креативный анализ и максимально креативное решение
+        pain_analysis, solution = await self.analysis_executor.analyze_and_generate(question_data['text'])
         
         shiza_text = f"""
 🧘 **КРЕАТИВНОЕ ШИЗА:**
@@ -385,15 +421,14 @@ class GamePrometheusBot:
             return
         
         # Получаем случайный вопрос
-        question_data = self.question_parser.get_random_question()
+        question_data = self.question_pool.get()
         
         if not question_data:
             await update.message.reply_text("❌ Не удалось получить вопрос для ваще.")
             return
         
         # Полный анализ
-        pain_analysis = self.pain_analyzer.analyze_pain(question_data['text'])
-        solution = self.solution_generator.generate_solution(pain_analysis)
+        pain_analysis, solution = await self.analysis_executor.analyze_and_generate(question_data['text'])
         
         # Рофло-рейтинг
         rofl_level = self._calculate_rofl_level(pain_analysis, solution)
@@ -499,7 +534,7 @@ class GamePrometheusBot:
         user_id = update.effective_user.id
         
         # Получаем случайный вопрос
-        question_data = self.question_parser.get_random_question()
+        question_data = self.question_pool.get()
         
         if not question_data:
             await self.send_message(update, "❌ Не удалось получить вопрос. Попробуйте позже.")
@@ -534,17 +569,14 @@ class GamePrometheusBot:
         question_data = self.question_parser.process_user_question(question_text)
         self.user_sessions[user_id]['current_question'] = question_data
         
-        # Анализируем боль
-        pain_analysis = self.pain_analyzer.analyze_pain(question_text)
+        # Анализируем боль и генерируем решение
+        pain_analysis, solution = await self.analysis_executor.analyze_and_generate(question_text)
         self.user_sessions[user_id]['current_analysis'] = pain_analysis
-        
-        # Генерируем решение
-        solution = self.solution_generator.generate_solution(pain_analysis)
         self.user_sessions[user_id]['current_solution'] = solution
         
         # Начисляем очки
         points = self._calculate_points(pain_analysis, solution)
-        self.user_sessions[user_id]['score'] += points
+        self._add_points(user_id, points)
         self.user_sessions[user_id]['questions_asked'] += 1
         
         # Показываем результат
@@ -591,12 +623,14 @@ class GamePrometheusBot:
             return
         
         question = session['current_question']
-        pain_analysis = self.pain_analyzer.analyze_pain(question['text'])
+        pain_analysis = await self.analysis_executor.analyze(question['text'])
+        # За время анализа сессия могла быть вытеснена из памяти: берем ее заново
+        session = self.user_sessions[user_id]
         session['current_analysis'] = pain_analysis
         
         # Начисляем очки за анализ
         analysis_points = 10
-        session['score'] += analysis_points
+        self._add_points(user_id, analysis_points)
         
         text = f"""
 🧠 **Анализ боли:**
@@ -636,12 +670,14 @@ class GamePrometheusBot:
             await self.send_message(update, "❌ Сначала проанализируйте боль")
             return
         
-        solution = self.solution_generator.generate_solution(session['current_analysis'])
+        question = session['current_question']
+        solution = await self.analysis_executor.generate(session['current_analysis'], question['text'] if question else None)
+        session = self.user_sessions[user_id]
         session['current_solution'] = solution
         
         # Начисляем очки за решение
         solution_points = 5
-        session['score'] += solution_points
+        self._add_points(user_id, solution_points)
         session['questions_asked'] += 1
         
         text = f"""
@@ -669,6 +705,44 @@ class GamePrometheusBot:
         
         await self.send_message(update, text, reply_markup=reply_markup, parse_mode='Markdown')
     
+    def _add_points(self, user_id: int, points: int):
+        """Начисляет очки в текущей игре и обновляет статистику и рейтинг"""
+        session = self.user_sessions[user_id]
+        session['score'] += points
+        
+        stats = self.game_stats.get(user_id)
+        if stats is None:
+            return
+        stats['total_score'] += points
+        # Рейтинг не опускается, даже если статистика отстала от него
+        best_score = max(stats['best_score'], self.leaderboard.score(user_id) or 0)
+        if session['score'] > best_score:
+            stats['best_score'] = session['score']
+            self.leaderboard.update(user_id, session['score'])
+            self.leaderboard_names[user_id] = session['username']
+    
+    async def show_leaderboard(self, query, user_id: int):
+        """Показывает топ игроков и место пользователя"""
+        top = self.leaderboard.top(config.LEADERBOARD_SIZE)
+        if not top:
+            await query.edit_message_text("🏆 Рейтинг пока пуст — сыграй первым: /play")
+            return
+        
+        medals = ['🥇', '🥈', '🥉']
+        lines = []
+        for place, (player_id, score) in enumerate(top, 1):
+            name = self.leaderboard_names.get(player_id, 'Игрок')
+            medal = medals[place - 1] if place <= len(medals) else f"{place}."
+            lines.append(f"{medal} {name} — {score} очков")
+        
+        rank = self.leaderboard.rank(user_id)
+        footer = f"📍 **Твое место:** {rank} из {len(self.leaderboard)}" if rank else "📍 Сыграй партию, чтобы попасть в рейтинг: /play"
+        
+        await query.edit_message_text(
+            "🏆 **Лидеры по лучшему результату:**\n\n" + "\n".join(lines) + "\n\n" + footer,
+            parse_mode='Markdown'
+        )
+    
     def _calculate_points(self, pain_analysis: dict, solution: dict) -> int:
         """Рассчитывает очки за ответ"""
         points = 0
@@ -686,6 +760,40 @@ class GamePrometheusBot:
         
         return points
     
+    def _cost_class(self, update: Update) -> str:
+        """Класс стоимости обновления для ограничения частоты"""
+        if update.callback_query:
+            data = update.callback_query.data or ''
+            return 'medium' if data.startswith('cat_') else CALLBACK_COST_CLASSES.get(data, 'light')
+        
+        text = update.message.text if update.message and update.message.text else ''
+        if re.match(DEMO_COMMAND_PATTERN, text):
+            return 'heavy'
+        if text.startswith('/'):
+            command = text[1:].split(maxsplit=1)[0].split('@')[0] if len(text) > 1 else ''
+            return COMMAND_COST_CLASSES.get(command, 'light')
+        # Свой вопрос уходит на анализ
+        return 'medium' if text else 'light'
+    
+    def admit_update(self, update: Update) -> Optional[float]:
+        """Через сколько секунд выполнять обновление (None — спам сливается с уже принятыми)"""
+        user = update.effective_user
+        if user is None:
+            return 0.0
+        return self.rate_limiter.reserve(user.id, self._cost_class(update))
+    
+    async def reject_update(self, update: Update):
+        """Отвечает на слитое обновление: кнопке — всегда, сообщениям — раз за окно"""
+        try:
+            if update.callback_query:
+                await update.callback_query.answer("⏳ Не так быстро, Магистр еще думает")
+            elif update.effective_message and self.rate_limiter.should_notify(update.effective_user.id):
+                await update.effective_message.reply_text(
+                    "⏳ Не так быстро: Магистр еще думает над прошлыми вопросами. Повтори чуть позже"
+                )
+        except TelegramError as e:
+            logger.warning(f"Не удалось предупредить о лимите: {e}")
+    
     async def send_message(self, update: Update, text: str, reply_markup=None, parse_mode=None):
         """Отправляет сообщение в зависимости от типа обновления"""
         if hasattr(update, 'edit_message_text'):
@@ -693,13 +801,34 @@ class GamePrometheusBot:
         else:
             await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
     
-    def run(self):
-        """Запускает бота"""
-        if not config.TELEGRAM_TOKEN:
-            logger.error("TELEGRAM_TOKEN не установлен!")
-            return
-        
-        application = Application.builder().token(config.TELEGRAM_TOKEN).build()
+    async def startup(self, application: Application):
+        """Запускает фоновое наполнение пула вопросов и пул анализа"""
+        self.question_pool.start()
+        self.analysis_executor.start()
+        self.user_sessions.start()
+        self.game_stats.start()
+    
+    async def shutdown(self, application: Application):
+        """Останавливает пулы, сохраняет сессии и закрывает сетевые сессии парсера"""
+        await self.question_pool.stop()
+        await self.analysis_executor.stop()
+        await self.user_sessions.stop()
+        await self.game_stats.stop()
+        await self.question_parser.aclose()
+    
+    def build_application(self, base_url: str = None) -> Application:
+        """Создает приложение со всеми обработчиками (base_url — другой адрес Bot API)"""
+        builder = Application.builder().token(config.TELEGRAM_TOKEN).post_init(self.startup).post_shutdown(self.shutdown)
+        # Разные пользователи обрабатываются параллельно, обновления одного — по порядку;
+        # частота команд проверяется по времени прихода: спам ждет очереди или сливается
+        builder = builder.concurrent_updates(
+            ChatOrderedUpdateProcessor(admit=self.admit_update, on_drop=self.reject_update)
+        )
+        # Исходящие сообщения ждут очереди в пределах лимитов Telegram
+        builder = builder.rate_limiter(OutboundRateLimiter())
+        if base_url:
+            builder = builder.base_url(base_url)
+        application = builder.build()
         
         # Добавляем обработчики
         application.add_handler(CommandHandler("start", self.start))
@@ -712,96 +841,108 @@ class GamePrometheusBot:
         application.add_handler(CommandHandler("bazar", self.bazar_command))
         application.add_handler(CommandHandler("shiza", self.shiza_command))
         application.add_handler(CommandHandler("vazshe", self.vazshe_command))
-        application.add_handler(CommandHandler("demo50", self.demo50_command))
+        # /demo, /demo50, /demo500...: CommandHandler не принимает число в имени команды
+        application.add_handler(MessageHandler(filters.Regex(DEMO_COMMAND_PATTERN), self.demo_command))
         
         application.add_handler(CallbackQueryHandler(self.button_handler))
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.message_handler))
         
+        return application
+    
+    def run(self, webhook: bool = False):
+        """Запускает бота (long polling или webhook-сервер)"""
+        if not config.TELEGRAM_TOKEN:
+            logger.error("TELEGRAM_TOKEN не установлен!")
+            return
+        
+        application = self.build_application()
+        
         # Запускаем бота
-        logger.info("Игровой бот запущен!")
-        application.run_polling()
+        if webhook:
+            logger.info("Игровой бот запущен в режиме webhook!")
+            asyncio.run(run_webhook(application))
+        else:
+            logger.info("Игровой бот запущен!")
+            application.run_polling()
     
-    async def demo50_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Команда /demo50 - демонстрация 50 рофло-вопросов"""
+    async def demo_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Команда /demoN - демонстрация N рофло-вопросов (по умолчанию 50)"""
         user_id = update.effective_user.id
         
         if user_id not in self.user_sessions:
             await update.message.reply_text("❌ Сначала используйте /start")
             return
         
-        await update.message.reply_text("🎭 **Запускаю демонстрацию 50 рофло-вопросов...**\n\nЭто займет несколько секунд! ⏳", parse_mode='Markdown')
+        count = int(context.match.group(1) or config.DEMO_DEFAULT_SIZE) if context.match else config.DEMO_DEFAULT_SIZE
+        if not 1 <= count <= config.DEMO_MAX_SIZE:
+            await update.message.reply_text(f"❌ Размер демонстрации: от 1 до {config.DEMO_MAX_SIZE} вопросов")
+            return
+        
+        # Прогресс показывается правкой одного сообщения
+        progress_message = await update.message.reply_text(
+            f"🎭 **Запускаю демонстрацию {count} рофло-вопросов...**\n\nЭто займет несколько секунд! ⏳",
+            parse_mode='Markdown'
+        )
+        
+        async def edit_progress(text: str):
+            try:
+                await progress_message.edit_text(text, parse_mode='Markdown')
+            except TelegramError as e:
+                logger.warning(f"Не удалось обновить прогресс демонстрации: {e}")
+        
+        async def show_progress(done: int):
+            await edit_progress(f"🎯 **Обработано вопросов:** {done}/{count}\n🚀 **Продолжаем анализ...**")
         
-        # Получаем 50 вопросов
-        questions = self.question_parser.get_multiple_questions(50)
+        # Храним только агрегаты и топ-5, а не все результаты
+        demo_stats = DemoStats()
         
-        # Генерируем решения для каждого вопроса
-        demo_results = []
-        for i, question in enumerate(questions[:50], 1):
+        def add_result(number: int, question: dict, pain_analysis, solution: dict):
             try:
-                # Анализируем боль
-                pain_analysis = self.pain_analyzer.analyze_pain(question['text'])
-                
-                # Генерируем решение
-                solution = self.solution_generator.generate_solution(pain_analysis)
-                
                 # Рофло-рейтинг
                 rofl_level = self._calculate_rofl_level(pain_analysis, solution)
                 
-                demo_results.append({
-                    'number': i,
+                demo_stats.add({
+                    'number': number,
                     'question': question,
                     'pain_analysis': pain_analysis,
                     'solution': solution,
                     'rofl_level': rofl_level
                 })
                 
-                # Показываем прогресс каждые 10 вопросов
-                if i % 10 == 0:
-                    progress_text = f"🎯 **Обработано вопросов:** {i}/50\n🚀 **Продолжаем анализ...**"
-                    await update.message.reply_text(progress_text, parse_mode='Markdown')
-                    
             except Exception as e:
                 # Если что-то пошло не так, добавляем простой результат
-                demo_results.append({
-                    'number': i,
+                demo_stats.add({
+                    'number': number,
                     'question': question,
                     'pain_analysis': {'main_pain': 'техническая ошибка', 'confidence_score': 0.1},
                     'solution': {'name': 'ErrorBot', 'full_solution': 'Исправляет ошибки в рофло-анализе'},
                     'rofl_level': {'stars': '🌟', 'description': 'Ошибка рофла'}
                 })
         
+        pipeline = DemoPipeline(self.question_parser, self.analysis_executor)
+        await pipeline.run(count, add_result, show_progress)
+        await edit_progress(f"✅ **Обработано вопросов:** {demo_stats.total}/{count}")
+        
         # Показываем итоговую статистику
-        await self._show_demo50_summary(update, demo_results)
+        await self._show_demo_summary(update, demo_stats)
     
-    async def _show_demo50_summary(self, update: Update, demo_results: list):
+    async def _show_demo_summary(self, update: Update, demo_stats: DemoStats):
         """Показывает итоговую статистику демонстрации"""
-        # Подсчитываем статистику
-        total_questions = len(demo_results)
-        roflo_questions = sum(1 for r in demo_results if r['question']['type'] == 'roflo')
-        real_questions = total_questions - roflo_questions
-        
-        # Средние показатели
-        avg_confidence = sum(r['pain_analysis']['confidence_score'] for r in demo_results) / total_questions
-        avg_rofl_level = sum(len(r['rofl_level']['stars']) for r in demo_results) / total_questions
-        
-        # Топ-5 самых рофло-решений
-        top_solutions = sorted(demo_results, key=lambda x: x['solution'].get('rofl_level', 0), reverse=True)[:5]
-        
         summary_text = f"""
-🎭 **ДЕМОНСТРАЦИЯ 50 РОФЛО-ВОПРОСОВ ЗАВЕРШЕНА!**
+🎭 **ДЕМОНСТРАЦИЯ {demo_stats.total} РОФЛО-ВОПРОСОВ ЗАВЕРШЕНА!**
 
 📊 **Общая статистика:**
-   • Всего вопросов: {total_questions}
-   • Рофло-вопросы: {roflo_questions}
-   • Реальные вопросы: {real_questions}
-   • Средняя уверенность: {avg_confidence:.1%}
-   • Средний рофло-уровень: {avg_rofl_level:.1f} звезд
+   • Всего вопросов: {demo_stats.total}
+   • Рофло-вопросы: {demo_stats.roflo_questions}
+   • Реальные вопросы: {demo_stats.real_questions}
+   • Средняя уверенность: {demo_stats.avg_confidence:.1%}
+   • Средний рофло-уровень: {demo_stats.avg_stars:.1f} звезд
 
 🏆 **ТОП-5 самых рофло-решений:**
 
 """
         
-        for i, result in enumerate(top_solutions, 1):
+        for i, result in enumerate(demo_stats.top(), 1):
             summary_text += f"""
 {i}. **{result['solution']['name']}**
    ❓ Вопрос: {result['question']['text'][:50]}...
@@ -818,7 +959,7 @@ class GamePrometheusBot:
    • /shiza для креативного шиза
    • /vazshe для полного рофло-анализа
 
-🚀 **Готов к IPO:** {len([r for r in demo_results if 'IPO' in str(r['rofl_level'])])} решений!
+🚀 **Готов к IPO:** {demo_stats.ipo_ready} решений!
         """
         
         # Создаем кнопки для навигации
@@ -0,0 +1,248 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Dict, Hashable, List, Optional, Tuple, Union
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+import config
+
+logger = logging.getLogger(__name__)
+
+CHAT_BURST = 3  # сообщений подряд в один чат до ограничения
+GLOBAL_BURST = 3  # сообщений подряд в общей очереди; темп уменьшен на запас, чтобы в любую секунду уходило не больше лимита
+
+class TokenBucket:
+    """Токен-бакет: rate запросов в секунду, не больше capacity подряд
+    
+    Хранится в виде GCRA — теоретическое время следующего запроса вместо числа
+    токенов. Так запрос можно учесть на будущий момент (резерв под тех, кто уже
+    ждет очереди, — они обслуживаются по порядку прихода) и согласовать
+    несколько бакетов: запрос уходит, когда готовы все.
+    """
+    
+    __slots__ = ('interval', 'tolerance', 'tat')
+    
+    def __init__(self, rate: float, capacity: float, now: float):
+        """Инициализация (бакет полный)"""
+        self.interval = 1 / rate
+        self.tolerance = (capacity - 1) * self.interval
+        self.tat = now
+    
+    def ready_at(self, now: float) -> float:
+        """Самый ранний момент, когда бакет пропустит запрос"""
+        return max(now, self.tat - self.tolerance)
+    
+    def commit(self, moment: float):
+        """Учитывает запрос, уходящий в момент moment"""
+        self.tat = max(self.tat, moment) + self.interval
+    
+    def reserve(self, now: float, max_wait: float = float('inf')) -> Optional[float]:
+        """Резервирует запрос и возвращает, сколько секунд ждать (None — дольше max_wait)"""
+        moment = self.ready_at(now)
+        if moment - now > max_wait:
+            return None
+        self.commit(moment)
+        return moment - now
+
+class BucketTable:
+    """Бакеты по ключам в LRU ограниченного размера
+    
+    Давно не использованный бакет успевает наполниться, поэтому его вытеснение
+    равносильно созданию нового полного бакета при следующем обращении.
+    """
+    
+    def __init__(self, max_size: int = None):
+        """Инициализация"""
+        self.max_size = max_size or config.RATE_LIMIT_MAX_BUCKETS
+        self._buckets: OrderedDict = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+    
+    def get(self, key: Hashable, rate: float, capacity: float, now: float) -> TokenBucket:
+        """Бакет ключа (создается полным)"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, capacity, now)
+            if len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+class UserRateLimiter:
+    """Ограничение частоты команд пользователя по классам стоимости
+    
+    У каждого пользователя свой бакет на класс (например, heavy для /demoN,
+    medium для парсинга и анализа, light для меню). Превышение не отклоняет
+    запрос сразу: он ждет своей очереди до max_wait секунд, и только если
+    ждать дольше, сливается с уже принятыми (отбрасывается с одним
+    предупреждением за окно).
+    """
+    
+    def __init__(self, cost_classes: Dict[str, Tuple[float, float]] = None, max_wait: float = None,
+                 max_size: int = None):
+        """Инициализация (cost_classes: класс -> (запросов в минуту, запас))"""
+        self.cost_classes = cost_classes or config.RATE_LIMIT_CLASSES
+        self.max_wait = config.RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+        self._buckets = BucketTable(max_size)
+        # Не больше одного предупреждения о лимите за max_wait секунд
+        self._notices = BucketTable(max_size)
+        self.allowed = 0
+        self.delayed = 0
+        self.coalesced = 0
+    
+    def reserve(self, user_id: Hashable, cost_class: str, now: float = None) -> Optional[float]:
+        """Резервирует запрос и возвращает ожидание в секундах (None — запрос слит)"""
+        now = time.monotonic() if now is None else now
+        per_minute, capacity = self.cost_classes[cost_class]
+        bucket = self._buckets.get((user_id, cost_class), per_minute / 60, capacity, now)
+        
+        wait = bucket.reserve(now, max_wait=self.max_wait)
+        if wait is None:
+            self.coalesced += 1
+        elif wait:
+            self.delayed += 1
+        else:
+            self.allowed += 1
+        return wait
+    
+    async def acquire(self, user_id: Hashable, cost_class: str) -> bool:
+        """Дожидается очереди запроса; False — запрос слит с предыдущими"""
+        wait = self.reserve(user_id, cost_class)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+    
+    def should_notify(self, user_id: Hashable, now: float = None) -> bool:
+        """Нужно ли предупредить пользователя о лимите (не чаще раза за окно)"""
+        now = time.monotonic() if now is None else now
+        window = max(self.max_wait, 1.0)
+        return self._notices.get(user_id, 1 / window, 1, now).reserve(now, max_wait=0) is not None
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика: пропущено сразу, после ожидания, слито и размер таблицы"""
+        return {
+            'allowed': self.allowed,
+            'delayed': self.delayed,
+            'coalesced': self.coalesced,
+            'buckets': len(self._buckets)
+        }
+
+class OutboundRateLimiter(BaseRateLimiter):
+    """Ограничитель исходящих запросов к Bot API (лимиты Telegram на рассылку)
+    
+    Запросы с chat_id проходят через общий бакет (RATE_OUTBOUND_PER_SECOND) и бакет
+    чата: личного — RATE_OUTBOUND_CHAT_PER_SECOND, группы — RATE_OUTBOUND_GROUP_PER_MINUTE.
+    Запросы ждут своей очереди, а не падают; при RetryAfter все запросы
+    приостанавливаются и повторяются до max_retries раз.
+    """
+    
+    def __init__(self, per_second: float = None, chat_per_second: float = None, group_per_minute: float = None,
+                 max_retries: int = None, max_size: int = None):
+        """Инициализация"""
+        self.per_second = per_second or config.RATE_OUTBOUND_PER_SECOND
+        self.chat_per_second = chat_per_second or config.RATE_OUTBOUND_CHAT_PER_SECOND
+        self.group_per_minute = group_per_minute or config.RATE_OUTBOUND_GROUP_PER_MINUTE
+        self.max_retries = config.RATE_OUTBOUND_MAX_RETRIES if max_retries is None else max_retries
+        if self.per_second <= GLOBAL_BURST:
+            raise ValueError(f"Общий лимит должен быть больше запаса {GLOBAL_BURST}: {self.per_second!r}")
+        self._global: Optional[TokenBucket] = None
+        self._chats = BucketTable(max_size)
+        # Чат -> [блокировка, число запросов в ней]; есть, только пока в чат что-то уходит
+        self._chat_turns: Dict[Union[int, str], list] = {}
+        self._retry_after = asyncio.Event()
+        self._retry_after.set()
+        self.delayed = 0
+        self.retries = 0
+    
+    async def initialize(self):
+        """Создает общий бакет
+        
+        В любое окно в 1 секунду бакет пропускает не больше GLOBAL_BURST - 1 + темп
+        запросов, поэтому темп — per_second - GLOBAL_BURST: с запасом на неточность
+        пробуждения таймеров в секунду уходит не больше per_second.
+        """
+        self._global = TokenBucket(self.per_second - GLOBAL_BURST, GLOBAL_BURST, time.monotonic())
+    
+    async def shutdown(self):
+        """Ресурсов не требуется"""
+    
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        """Выполняет запрос, дождавшись места в бакетах"""
+        chat_id = data.get('chat_id')
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+        
+        max_retries = rate_limit_args or self.max_retries
+        for attempt in range(max_retries + 1):
+            await self._retry_after.wait()
+            try:
+                if chat_id is None:
+                    return await callback(*args, **kwargs)
+                return await self._send_in_turn(chat_id, callback, args, kwargs)
+            except RetryAfter as e:
+                if attempt == max_retries:
+                    raise
+                self.retries += 1
+                logger.warning(f"Telegram просит подождать {e.retry_after} с ({endpoint}), повтор {attempt + 1}")
+                # Пока ждем, остальные запросы тоже не уходят
+                self._retry_after.clear()
+                try:
+                    await asyncio.sleep(float(e.retry_after) + 0.1)
+                finally:
+                    self._retry_after.set()
+    
+    async def _send_in_turn(self, chat_id: Union[int, str], callback, args: Any, kwargs: Dict[str, Any]):
+        """Отправляет запрос в чат по очереди: интервалы чата считаются от реальной отправки"""
+        turn = self._chat_turns.get(chat_id)
+        if turn is None:
+            turn = self._chat_turns[chat_id] = [asyncio.Lock(), 0]
+        turn[1] += 1
+        
+        try:
+            async with turn[0]:
+                now = time.monotonic()
+                # Строковые chat_id бывают только у каналов и супергрупп
+                if isinstance(chat_id, str) or chat_id < 0:
+                    chat_bucket = self._chats.get(chat_id, self.group_per_minute / 60, CHAT_BURST, now)
+                else:
+                    chat_bucket = self._chats.get(chat_id, self.chat_per_second, CHAT_BURST, now)
+                
+                # Сначала лимит чата, затем общая очередь: чат, упершийся в свой лимит,
+                # не занимает общий запас
+                wait = chat_bucket.ready_at(now) - now
+                if wait > 0:
+                    self.delayed += 1
+                    await asyncio.sleep(wait)
+                wait = self._global.reserve(time.monotonic())
+                if wait:
+                    self.delayed += 1
+                    await asyncio.sleep(wait)
+                
+                chat_bucket.commit(time.monotonic())
+                return await callback(*args, **kwargs)
+        finally:
+            turn[1] -= 1
+            if not turn[1]:
+                del self._chat_turns[chat_id]
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика: запросы, ждавшие очереди, повторы и размер таблицы чатов"""
+        return {
+            'delayed': self.delayed,
+            'retries': self.retries,
+            'chats': len(self._chats)
+        }
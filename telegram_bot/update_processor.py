@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+import config
+
+logger = logging.getLogger(__name__)
+
+def update_key(update: object) -> Optional[Hashable]:
+    """Ключ порядка обновления: пользователь (владелец сессии), иначе чат"""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_user:
+        return update.effective_user.id
+    if update.effective_chat:
+        return update.effective_chat.id
+    return None
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Параллельная обработка обновлений разных пользователей со строгим порядком внутри каждого
+    
+    Одновременно выполняется не больше max_concurrent_updates обработчиков.
+    Первое обновление пользователя выполняет по очереди все его обновления,
+    пришедшие следом; они только встают в очередь, поэтому долгий /demo50 одного
+    игрока не задерживает кнопки остальных, а обработчики одного игрока не
+    перемешивают его сессию.
+    
+    admit(update) решает в момент прихода, когда обновление можно выполнять:
+    через сколько секунд или None — не выполнять. Вместо отклоненного в свою
+    очередь встает on_drop(update). Место занимается только на время работы
+    обработчика: отложенные лимитом обновления ждут своего момента без места.
+    """
+    
+    def __init__(self, max_concurrent_updates: int = None,
+                 admit: Callable[[object], Optional[float]] = None,
+                 on_drop: Callable[[object], Awaitable[Any]] = None):
+        """Инициализация"""
+        limit = max_concurrent_updates or config.BOT_CONCURRENT_UPDATES
+        if limit < 1:
+            raise ValueError("max_concurrent_updates должен быть положительным")
+        # Семафор PTB берется до do_process_update, то есть до admit и ожидания лимита;
+        # его делаем неограничивающим, а места раздает свой семафор
+        super().__init__(sys.maxsize)
+        self._max_concurrent_updates = limit
+        self._slots = asyncio.Semaphore(limit)
+        self.admit = admit
+        self.on_drop = on_drop
+        # Ключ -> (сопрограмма, не раньше момента) в обработке (первая выполняется);
+        # ключ есть, пока очередь не пуста
+        self._queues: Dict[Hashable, Deque[Tuple[Awaitable[Any], float]]] = {}
+        self.running = 0
+        self.processed = 0
+        self.deferred = 0
+        self.dropped = 0
+    
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        not_before = 0.0
+        if self.admit is not None:
+            delay = self.admit(update)
+            if delay is None:
+                coroutine.close()
+                self.dropped += 1
+                if self.on_drop is None:
+                    return
+                coroutine = self.on_drop(update)
+            else:
+                not_before = time.monotonic() + delay
+        
+        key = update_key(update)
+        if key is None:
+            await self._run(key, coroutine, not_before)
+            return
+        
+        queue = self._queues.get(key)
+        if queue is not None:
+            # Обновления этого пользователя уже выполняются: встаем за ними
+            queue.append((coroutine, not_before))
+            self.deferred += 1
+            return
+        
+        queue = self._queues[key] = deque([(coroutine, not_before)])
+        try:
+            while queue:
+                await self._run(key, *queue[0])
+                queue.popleft()
+        finally:
+            del self._queues[key]
+            # Остановка посреди очереди: невыполненные сопрограммы закрываются
+            if queue:
+                for pending, _ in queue:
+                    pending.close()
+                logger.warning(f"Отброшено обновлений {key} при остановке: {len(queue)}")
+    
+    async def _run(self, key: Optional[Hashable], coroutine: Awaitable[Any], not_before: float):
+        """Выполняет обновление не раньше назначенного момента; место занимает только обработчик"""
+        wait = not_before - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._slots:
+            self.running += 1
+            try:
+                await coroutine
+            except Exception as e:
+                logger.error(f"Ошибка обработки обновления {key}: {e}")
+            finally:
+                self.running -= 1
+        self.processed += 1
+    
+    async def initialize(self):
+        """Ресурсов не требуется"""
+    
+    async def shutdown(self):
+        """Ресурсов не требуется"""
+    
+    def stats(self) -> Dict[str, int]:
+        """Состояние: предел, занятые места, активные пользователи, ждущие и отклоненные обновления"""
+        return {
+            'max_concurrent_updates': self.max_concurrent_updates,
+            'running': self.running,
+            'active': len(self._queues),
+            'queued': sum(len(queue) - 1 for queue in self._queues.values()),
+            'processed': self.processed,
+            'deferred': self.deferred,
+            'dropped': self.dropped
+        }
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+import signal
+from typing import Optional
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+import config
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+class WebhookServer:
+    """Встроенный HTTP-сервер aiohttp, принимающий обновления Telegram по webhook
+    
+    Обработчик запроса только разбирает JSON и кладет обновление в очередь
+    приложения, поэтому Telegram получает ответ сразу, а обработка идет
+    параллельно (сколько обновлений одновременно — concurrent_updates приложения).
+    Сервер можно проверить локально, отправив POST с записанным JSON обновления.
+    """
+    
+    def __init__(self, application: Application, host: str = None, port: int = None,
+                 path: str = None, secret_token: str = None):
+        """Инициализация"""
+        self.application = application
+        self.host = host or config.WEBHOOK_HOST
+        self.port = config.WEBHOOK_PORT if port is None else port
+        self.path = path or config.WEBHOOK_PATH
+        self.secret_token = config.WEBHOOK_SECRET if secret_token is None else secret_token
+        self._runner: Optional[web.AppRunner] = None
+        self.received = 0
+        self.rejected = 0
+    
+    async def start(self):
+        """Запускает HTTP-сервер"""
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_update)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Webhook-сервер слушает http://{self.host}:{self.port}{self.path}")
+    
+    async def stop(self):
+        """Останавливает HTTP-сервер"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def handle_update(self, request: web.Request) -> web.Response:
+        """Принимает одно обновление и ставит его в очередь приложения"""
+        if self.secret_token and request.headers.get(SECRET_HEADER) != self.secret_token:
+            self.rejected += 1
+            return web.Response(status=403)
+        
+        try:
+            update = Update.de_json(await request.json(), self.application.bot)
+        except (json.JSONDecodeError, TypeError, KeyError, ValueError) as e:
+            self.rejected += 1
+            logger.warning(f"Некорректное обновление webhook: {e}")
+            return web.Response(status=400)
+        
+        self.received += 1
+        await self.application.update_queue.put(update)
+        return web.Response()
+
+async def run_webhook(application: Application, server: WebhookServer = None, webhook_url: str = None):
+    """Работает в режиме webhook до SIGINT/SIGTERM (тот же жизненный цикл, что у run_polling)
+    
+    Если задан адрес (webhook_url или config.WEBHOOK_URL), он регистрируется в
+    Telegram через setWebhook; без него сервер принимает только локальные POST.
+    """
+    server = server or WebhookServer(application)
+    webhook_url = webhook_url or config.WEBHOOK_URL
+    stop_event = asyncio.Event()
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    
+    try:
+        await server.start()
+        if webhook_url:
+            await application.bot.set_webhook(
+                url=webhook_url.rstrip('/') + server.path,
+                secret_token=server.secret_token or None,
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info(f"Webhook зарегистрирован: {webhook_url.rstrip('/')}{server.path}")
+        else:
+            logger.info("WEBHOOK_URL не задан: setWebhook не вызывается, обновления принимаются локально")
+        
+        await application.start()
+        await stop_event.wait()
+    finally:
+        await server.stop()
+        if application.running:
+            await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)